@@ -0,0 +1,180 @@
+"""Atlassian Document Format (ADF) -> Markdown, rendered iteratively into one buffer with a size budget."""
+
+import json
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from itertools import chain
+
+# Inline marks, applied innermost first
+_MARKS = (
+    ("code", "`{}`"),
+    ("strong", "**{}**"),
+    ("em", "*{}*"),
+    ("strike", "~~{}~~"),
+    ("underline", "{}"),
+)
+
+
+def _text(node: dict, inline: bool) -> str:
+    text = node.get("text", "")
+    if inline:
+        text = text.replace("\n", " ")
+    marks = {m.get("type"): m.get("attrs") or {} for m in node.get("marks") or []}
+    for mark, fmt in _MARKS:
+        if mark in marks and text:
+            text = fmt.format(text)
+    if "link" in marks and marks["link"].get("href"):
+        text = f"[{text}]({marks['link']['href']})"
+    return text
+
+
+def _leaf(kind: str, attrs: dict) -> str | None:
+    """Text for inline nodes without content; None for anything else."""
+    if kind == "mention":
+        return attrs.get("text") or f"@{attrs.get('id', '')}"
+    if kind == "emoji":
+        return attrs.get("text") or attrs.get("shortName", "")
+    if kind in ("inlineCard", "blockCard", "embedCard"):
+        return attrs.get("url", "")
+    if kind == "status":
+        return f"[{attrs.get('text', '')}]"
+    if kind == "date":
+        try:
+            return datetime.fromtimestamp(int(attrs.get("timestamp")) / 1000, timezone.utc).strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            return ""
+    if kind == "media":
+        return f"[{attrs.get('alt') or 'attachment'}]"
+    return None
+
+
+def _entries(nodes: list, prefix: str, tight: bool, inline: bool) -> Iterator[tuple]:
+    for node in nodes:
+        yield node, prefix, tight, inline
+
+
+def adf_to_markdown(doc: dict | str | None, max_chars: int | None = None) -> str:
+    """Render an ADF document (dict or JSON string) as Markdown: headings, paragraphs, nested
+    bullet/ordered/task lists, code blocks, quotes, tables and inline marks.
+    Walks the tree with an explicit stack (no recursion) and stops once max_chars is reached."""
+    if isinstance(doc, str):
+        try:
+            doc = json.loads(doc)
+        except ValueError:
+            return doc[:max_chars] if max_chars else doc
+    if not isinstance(doc, dict):
+        return ""
+
+    out: list[str] = []
+    size = 0
+    at_line_start = True
+
+    def emit(text: str, prefix: str) -> None:
+        nonlocal size, at_line_start
+        for part in text.splitlines(keepends=True):
+            if at_line_start and prefix and part != "\n":
+                out.append(prefix)
+                size += len(prefix)
+            out.append(part)
+            size += len(part)
+            at_line_start = part.endswith("\n")
+
+    # Entries: (node or literal string, line prefix, tight, inline).
+    # tight: block ends with one newline (list items); inline: blocks collapse to one line (table cells).
+    # The stack holds iterators of entries so large child lists are expanded lazily.
+    stack: list[Iterator[tuple]] = [iter([(doc, "", False, False)])]
+    truncated = False
+    while stack:
+        if max_chars is not None and size >= max_chars:
+            # Only trailing whitespace left means the document fit exactly
+            truncated = any(not isinstance(e[0], str) or e[0].strip() for it in reversed(stack) for e in it)
+            break
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        item, prefix, tight, inline = entry
+        if isinstance(item, str):
+            emit(item, prefix)
+            continue
+        if not isinstance(item, dict):
+            continue
+        kind = item.get("type")
+        attrs = item.get("attrs") or {}
+        children = item.get("content") or []
+        end = " " if inline else ("\n" if tight else "\n\n")
+        push: list = []
+
+        if kind == "text":
+            emit(_text(item, inline), prefix)
+        elif kind == "hardBreak":
+            emit(" " if inline else "\n", prefix)
+        elif kind == "rule":
+            emit("---" + end, prefix)
+        elif (leaf := _leaf(kind, attrs)) is not None:
+            emit(leaf, prefix)
+        elif kind in ("paragraph", "heading"):
+            if kind == "heading" and not inline:
+                push.append(("#" * int(attrs.get("level", 1)) + " ", prefix, tight, inline))
+            push.append(_entries(children, prefix, tight, inline))
+            push.append((end, prefix, tight, inline))
+        elif kind == "codeBlock":
+            if inline:
+                push.append(("`", prefix, tight, inline))
+                push.append(_entries(children, prefix, tight, inline))
+                push.append(("` ", prefix, tight, inline))
+            else:
+                push.append((f"```{attrs.get('language') or ''}\n", prefix, tight, inline))
+                code = [{"type": "text", "text": c.get("text", "")} for c in children]
+                push.append(_entries(code, prefix, tight, inline))
+                push.append(("\n```" + end, prefix, tight, inline))
+        elif kind in ("bulletList", "orderedList", "taskList", "decisionList"):
+            number = int(attrs.get("order", 1) or 1)
+            for child in children:
+                state = (child.get("attrs") or {}).get("state")
+                if kind == "orderedList":
+                    marker = f"{number}. "
+                    number += 1
+                elif kind == "taskList":
+                    marker = "- [x] " if state == "DONE" else "- [ ] "
+                else:
+                    marker = "- "
+                push.append((marker, prefix, True, inline))
+                push.append((child, prefix + " " * len(marker), True, inline))
+            if not tight and not inline:
+                push.append(("\n", prefix, tight, inline))
+        elif kind in ("listItem", "taskItem", "decisionItem"):
+            if kind != "listItem":
+                # Task and decision items hold inline content directly
+                push.append(_entries(children, prefix, True, inline))
+                push.append(("\n", prefix, True, inline))
+            else:
+                push.append(_entries(children, prefix, True, inline))
+        elif kind in ("blockquote", "panel"):
+            push.append(_entries(children, prefix + "> ", tight, inline))
+        elif kind in ("expand", "nestedExpand"):
+            if attrs.get("title"):
+                push.append((f"**{attrs['title']}**{end}", prefix, tight, inline))
+            push.append(_entries(children, prefix, tight, inline))
+        elif kind == "table":
+            for i, row in enumerate(children):
+                cells = row.get("content") or []
+                push.append(("|", prefix, tight, inline))
+                for cell in cells:
+                    push.append((" ", prefix, tight, True))
+                    push.append(_entries(cell.get("content") or [], prefix, tight, True))
+                    push.append(("|", prefix, tight, True))
+                push.append(("\n", prefix, tight, inline))
+                if i == 0:
+                    push.append(("|" + " --- |" * len(cells) + "\n", prefix, tight, inline))
+            push.append(("\n", prefix, tight, inline))
+        else:
+            # doc, mediaSingle, mediaGroup, extensions and unknown containers: render children
+            push.append(_entries(children, prefix, tight, inline))
+        if push:
+            stack.append(chain.from_iterable(p if isinstance(p, Iterator) else (p,) for p in push))
+
+    text = "".join(out)
+    if max_chars is not None and (size > max_chars or truncated):
+        return text[:max_chars].rstrip() + " …"
+    return text.strip()
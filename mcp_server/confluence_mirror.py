@@ -0,0 +1,159 @@
+"""Local SQLite mirror of Confluence spaces: page text in an FTS5 index ranked with BM25."""
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from utils import get_cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    doc INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    space TEXT NOT NULL,
+    title TEXT,
+    version INTEGER,
+    modified TEXT,
+    url TEXT,
+    chars INTEGER,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_space ON pages(space);
+-- rowid = pages.doc
+CREATE VIRTUAL TABLE IF NOT EXISTS page_text USING fts5(title, body, tokenize = 'porter unicode61');
+CREATE TABLE IF NOT EXISTS spaces (key TEXT PRIMARY KEY, space_id TEXT, last_sync REAL, last_modified TEXT);
+"""
+
+# Title matches weigh more than body matches in the BM25 score
+_TITLE_WEIGHT = 5.0
+_BODY_WEIGHT = 1.0
+# Queries using FTS5 syntax (phrases, prefixes, operators, title:/body: column filters) are passed
+# through as-is; anything else, or syntax FTS5 rejects, is split into OR-ed terms
+_FTS_SYNTAX = re.compile(r'"|\*|\b(AND|OR|NOT|NEAR)\b|\b(title|body):')
+
+
+def db_path() -> Path:
+    return get_cache_dir("confluence") / "mirror.sqlite3"
+
+
+def connect() -> sqlite3.Connection:
+    """Open the mirror database (created on first use). WAL lets searches run during a sync."""
+    conn = sqlite3.connect(db_path(), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def get_space(conn: sqlite3.Connection, key: str) -> tuple[str | None, float | None, str | None]:
+    """(space id, last sync time, newest page modification seen) for a mirrored space key."""
+    row = conn.execute("SELECT space_id, last_sync, last_modified FROM spaces WHERE key = ?", (key,)).fetchone()
+    return row if row else (None, None, None)
+
+
+def set_space(conn: sqlite3.Connection, key: str, space_id: str, last_sync: float, last_modified: str | None) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO spaces(key, space_id, last_sync, last_modified) VALUES (?, ?, ?, ?)",
+        (key, space_id, last_sync, last_modified),
+    )
+
+
+def list_spaces(conn: sqlite3.Connection) -> list[dict]:
+    rows = conn.execute(
+        "SELECT s.key, s.last_sync, count(p.id) FROM spaces s LEFT JOIN pages p ON p.space = s.key GROUP BY s.key"
+    )
+    return [
+        {"space": key, "pages": n, "age_seconds": round(time.time() - last) if last else None} for key, last, n in rows
+    ]
+
+
+def page_versions(conn: sqlite3.Connection, space: str) -> dict[str, int]:
+    return dict(conn.execute("SELECT id, version FROM pages WHERE space = ?", (space,)))
+
+
+def upsert_page(
+    conn: sqlite3.Connection,
+    page_id: str,
+    space: str,
+    title: str,
+    version: int | None,
+    modified: str | None,
+    url: str,
+    text: str,
+) -> None:
+    values = (space, title, version, modified, url, len(text), time.time(), page_id)
+    row = conn.execute("SELECT doc FROM pages WHERE id = ?", (page_id,)).fetchone()
+    if row:
+        doc = row[0]
+        conn.execute(
+            "UPDATE pages SET space = ?, title = ?, version = ?, modified = ?, url = ?, chars = ?, synced_at = ? "
+            "WHERE id = ?",
+            values,
+        )
+        conn.execute("DELETE FROM page_text WHERE rowid = ?", (doc,))
+    else:
+        doc = conn.execute(
+            "INSERT INTO pages(space, title, version, modified, url, chars, synced_at, id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            values,
+        ).lastrowid
+    conn.execute("INSERT INTO page_text(rowid, title, body) VALUES (?, ?, ?)", (doc, title, text))
+
+
+def prune(conn: sqlite3.Connection, space: str, keep: set[str]) -> int:
+    """Drop pages of space that are not in keep (deleted or moved since the last full sync)."""
+    rows = conn.execute("SELECT doc, id FROM pages WHERE space = ?", (space,)).fetchall()
+    gone = [doc for doc, pid in rows if pid not in keep]
+    for doc in gone:
+        conn.execute("DELETE FROM pages WHERE doc = ?", (doc,))
+        conn.execute("DELETE FROM page_text WHERE rowid = ?", (doc,))
+    return len(gone)
+
+
+def page_text(conn: sqlite3.Connection, page_id: str) -> tuple[str, str] | None:
+    """(title, Markdown text) of a mirrored page."""
+    return conn.execute(
+        "SELECT t.title, t.body FROM pages p JOIN page_text t ON t.rowid = p.doc WHERE p.id = ?", (page_id,)
+    ).fetchone()
+
+
+def _quoted_terms(query: str) -> str:
+    return " OR ".join(f'"{t}"' for t in re.findall(r"\w+", query))
+
+
+def search(conn: sqlite3.Connection, query: str, spaces: list[str] | None, limit: int) -> list[dict]:
+    """BM25-ranked full-text search over mirrored pages, best first, with a highlighted snippet."""
+    quoted = _quoted_terms(query)
+    if _FTS_SYNTAX.search(query):
+        try:
+            return _search(conn, query, spaces, limit)
+        except sqlite3.OperationalError:
+            pass  # malformed expression: fall back to plain terms
+    return _search(conn, quoted, spaces, limit) if quoted else []
+
+
+def _search(conn: sqlite3.Connection, match: str, spaces: list[str] | None, limit: int) -> list[dict]:
+    sql = (
+        "SELECT p.id, p.space, p.title, p.url, p.modified, "
+        f"bm25(page_text, {_TITLE_WEIGHT}, {_BODY_WEIGHT}) AS score, "
+        "snippet(page_text, 1, '**', '**', '…', 24) "
+        "FROM page_text JOIN pages p ON p.doc = page_text.rowid WHERE page_text MATCH ?"
+    )
+    params: list = [match]
+    if spaces:
+        sql += f" AND p.space IN ({', '.join('?' * len(spaces))})"
+        params.extend(spaces)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+    return [
+        {
+            "id": pid,
+            "space": space,
+            "title": title,
+            "url": url,
+            "modified": modified,
+            "score": round(-score, 3),
+            "snippet": snippet,
+        }
+        for pid, space, title, url, modified, score, snippet in conn.execute(sql, params)
+    ]
@@ -0,0 +1,151 @@
+"""Unified diff helpers: split a streamed diff per file and page through files under a byte budget."""
+
+from collections.abc import Iterable, Iterator
+
+_DIFF_HEADERS = ("diff --git ", "diff --cc ", "diff --combined ")
+_C_ESCAPES = {"a": "\a", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+
+def unquote_diff_path(name: str) -> str:
+    """Path as written in a diff header: git appends a TAB to '---'/'+++' names containing a space and
+    C-quotes names with special characters ("b/caf\\303\\251.py"), octal escapes being UTF-8 bytes."""
+    name = name.rstrip("\t")
+    if len(name) < 2 or not (name.startswith('"') and name.endswith('"')):
+        return name
+    out = bytearray()
+    i, body = 0, name[1:-1]
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\" and i + 1 < len(body):
+            nxt = body[i + 1]
+            if nxt in "01234567":
+                digits = body[i + 1 : i + 4]
+                out.append(int(digits, 8) & 0xFF)
+                i += 1 + len(digits)
+                continue
+            out.extend(_C_ESCAPES.get(nxt, nxt).encode())
+            i += 2
+            continue
+        out.extend(ch.encode())
+        i += 1
+    return out.decode("utf-8", errors="replace")
+
+
+def diff_file_path(header: str) -> str:
+    """Best-effort path from a 'diff --git a/x b/x' header (the b/ side, i.e. the new path)."""
+    if header.startswith("diff --git "):
+        rest = header[len("diff --git ") :]
+        if ' "b/' in rest:
+            return unquote_diff_path('"' + rest.rpartition(' "b/')[2])
+        _, _, path = rest.partition(" b/")
+        return path or rest
+    return unquote_diff_path(header.split(" ", 2)[-1])
+
+
+def iter_file_diffs(lines: Iterable[str]) -> Iterator[tuple[str, list[str]]]:
+    """Yield (path, lines) per file from a stream of unified diff lines (without trailing newlines)."""
+    path, chunk = None, []
+    for line in lines:
+        if line.startswith(_DIFF_HEADERS):
+            if path is not None:
+                yield path, chunk
+            path, chunk = diff_file_path(line), [line]
+        elif path is not None:
+            if line.startswith("+++ "):
+                name = unquote_diff_path(line[4:])
+                if name.startswith("b/"):
+                    path = name[2:]
+            chunk.append(line)
+    if path is not None:
+        yield path, chunk
+
+
+def page_file_diffs(
+    file_diffs: Iterable[tuple[str, list[str]]],
+    file_offset: int = 0,
+    max_bytes: int = 20000,
+    files: set[str] | None = None,
+    hunk_offset: int = 0,
+) -> tuple[list[str], int | None, int]:
+    """Collect whole file diffs starting at file_offset until max_bytes is used.
+    A file larger than the whole budget is cut at a hunk boundary when it is first on the page;
+    hunk_offset skips that many hunks of the file at file_offset (to continue a file cut earlier).
+    files limits output to those paths (offsets then count only matching files).
+    Returns (rendered file diffs, next file_offset or None when done, next hunk_offset). Stops
+    consuming the iterator as soon as the page is full, so a streaming source can be closed early."""
+    page: list[str] = []
+    used = 0
+    index = -1
+    for path, chunk in file_diffs:
+        if files is not None and path not in files:
+            continue
+        index += 1
+        if index < file_offset:
+            continue
+        skipped = hunk_offset if index == file_offset else 0
+        if skipped:
+            chunk = skip_hunks(chunk, skipped)
+        text = "\n".join(chunk)
+        if used + len(text) > max_bytes:
+            if page:
+                return page, index, 0
+            text, taken, remaining = _cut_at_hunk(chunk, max_bytes)
+            page.append(text)
+            if remaining:
+                return page, index, skipped + taken
+            return page, index + 1, 0
+        page.append(text)
+        used += len(text)
+    return page, None, 0
+
+
+def skip_hunks(chunk: list[str], count: int) -> list[str]:
+    """A file diff without its first count hunks (shown on an earlier page); the file header is kept."""
+    head, hunks = _split_hunks(chunk)
+    kept = hunks[count:]
+    marker = f"... ({len(hunks) - len(kept)} earlier hunk(s) of this file omitted)"
+    return head + [marker] + [line for hunk in kept for line in hunk]
+
+
+def _split_hunks(chunk: list[str]) -> tuple[list[str], list[list[str]]]:
+    """(file header lines, hunks) of one file diff; each hunk starts with its '@@' line."""
+    head: list[str] = []
+    hunks: list[list[str]] = []
+    for line in chunk:
+        if line.startswith("@@"):
+            hunks.append([line])
+        elif hunks:
+            hunks[-1].append(line)
+        else:
+            head.append(line)
+    return head, hunks
+
+
+def _cut_at_hunk(chunk: list[str], max_bytes: int) -> tuple[str, int, int]:
+    """Render the file header and as many whole hunks as fit (at least one, cut if it alone is too large).
+    Returns (text, hunks rendered, hunks left)."""
+    head, hunks = _split_hunks(chunk)
+    out = list(head)
+    used = sum(len(line) + 1 for line in head)
+    taken = 0
+    for hunk in hunks:
+        size = sum(len(line) + 1 for line in hunk)
+        if taken and used + size > max_bytes:
+            break
+        taken += 1
+        if used + size > max_bytes:
+            # A single hunk larger than the budget: keep its first lines
+            kept = []
+            for line in hunk:
+                if used + len(line) + 1 > max_bytes and kept:
+                    break
+                kept.append(line)
+                used += len(line) + 1
+            out += kept + [f"... ({len(hunk) - len(kept)} more line(s) of this hunk omitted to fit max_bytes)"]
+            break
+        out += hunk
+        used += size
+    remaining = len(hunks) - taken
+    if remaining:
+        out.append(f"... ({remaining} more hunk(s) in this file on the next page)")
+    return "\n".join(out), taken, remaining
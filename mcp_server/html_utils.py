@@ -0,0 +1,306 @@
+"""HTML / Confluence storage format -> Markdown in one streaming pass, with a heading outline and section selection."""
+
+import re
+from html.parser import HTMLParser
+
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_MARKS = {"strong": "**", "b": "**", "em": "*", "i": "*", "code": "`", "s": "~~", "del": "~~"}
+_BLOCKS = {"p", "div", "section", "article", "header", "footer", "main", "dl", "dt", "dd", "figure", "figcaption"}
+_SKIP = {"script", "style", "head", "ac:parameter", "ac:placeholder", "ac:task-id"}
+# Macros rendered as quoted callouts; their title defaults to the macro name
+_CALLOUTS = {"info", "note", "tip", "warning", "panel"}
+_FEED_CHUNK = 64 * 1024
+
+
+class _MarkdownWriter(HTMLParser):
+    """Single-pass converter. Text outside the selected section is counted (for the outline) but not kept."""
+
+    def __init__(self, section: str | None, max_chars: int | None) -> None:
+        super().__init__(convert_charrefs=True)
+        self.section = " ".join(section.split()).lower() if section else None
+        self.max_chars = max_chars
+        self.keep = self.section is None
+        self.section_level: int | None = None
+        self.section_done = False
+        self.out: list[str] = []
+        self.size = 0  # kept characters
+        self.pos = 0  # all characters produced (outline offsets)
+        self.tail = "\n\n"  # last two characters produced
+        self.truncated = False
+        self.outline: list[dict] = []
+        self.prefixes: list[str] = []  # blockquote / list continuation prefixes
+        self.lists: list[list] = []  # [tag, next number]
+        self.after_marker = False
+        self.heading: list | None = None  # [level, text parts]
+        self.skip = 0
+        self.pre = 0
+        self.cells = 0
+        self.rows: list[int] = []  # rows written per open table
+        self.row_cells = 0
+        self.links: list[tuple[str | None, int]] = []  # (href, pos after '[')
+        self.link_title = ""
+        self.macros: list[dict] = []
+        self.param: str | None = None
+
+    # ── output ──────────────────────────────────────────────────────────────
+
+    def _put(self, text: str) -> None:
+        self.pos += len(text)
+        self.tail = (self.tail + text)[-2:]
+        if not self.keep:
+            return
+        if self.max_chars is not None and self.size + len(text) > self.max_chars:
+            # Keep what still fits; once truncated nothing more is kept. Cutting only whitespace (block
+            # separators) does not count as truncation.
+            if not self.truncated:
+                room = self.max_chars - self.size
+                self.out.append(text[:room])
+                self.size += len(text[:room])
+                self.truncated = bool(text[room:].strip())
+            return
+        self.out.append(text)
+        self.size += len(text)
+
+    def _write(self, text: str) -> None:
+        if not text:
+            return
+        prefix = "".join(self.prefixes)
+        for part in text.splitlines(keepends=True):
+            if prefix and self.tail.endswith("\n") and part != "\n" and not self.cells:
+                self._put(prefix)
+            self._put(part)
+        self.after_marker = False
+
+    def _block(self, sep: str = "\n\n") -> None:
+        """Ensure the next output starts a new block (blank line) or, with sep='\\n', a new line."""
+        if self.cells:
+            if not self.tail.endswith(" "):
+                self._put(" ")
+            return
+        if self.tail.endswith(sep) or (sep == "\n" and self.tail.endswith("\n")):
+            return
+        self._put("\n" if self.tail.endswith("\n") else sep)
+
+    # ── parser callbacks ────────────────────────────────────────────────────
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        a = dict(attrs)
+        if tag in _SKIP:
+            self.skip += 1
+            if tag == "ac:parameter":
+                self.param = a.get("ac:name") or ""
+            return
+        if self.skip:
+            return
+        if tag in _HEADINGS:
+            self._block()
+            self.heading = [_HEADINGS[tag], []]
+        elif self.heading is not None:
+            return
+        elif tag in _MARKS:
+            self._write(_MARKS[tag])
+        elif tag in ("a", "ac:link"):
+            self._write("[")
+            self.links.append((a.get("href"), self.pos))
+            self.link_title = ""
+        elif tag in ("ri:page", "ri:attachment", "ri:user", "ri:space"):
+            self.link_title = a.get("ri:content-title") or a.get("ri:filename") or a.get("ri:space-key") or ""
+            if tag == "ri:attachment" and not self.links:
+                self._write(f"[attachment: {self.link_title}]")
+        elif tag in ("img", "ac:image"):
+            if tag == "img":
+                self._write(f"[image: {a.get('alt') or a.get('src', '')}]")
+        elif tag == "br":
+            self._write(" " if self.cells else "\n")
+        elif tag == "hr":
+            self._block()
+            self._write("---")
+            self._block()
+        elif tag in ("ul", "ol", "ac:task-list"):
+            self._block("\n" if self.lists else "\n\n")
+            self.lists.append([tag, int(a.get("start", 1) or 1)])
+        elif tag in ("li", "ac:task"):
+            self._block("\n")
+            kind = self.lists[-1] if self.lists else ["ul", 1]
+            marker = f"{kind[1]}. " if kind[0] == "ol" else "- "
+            kind[1] += 1
+            self._write(marker)
+            self.prefixes.append(" " * len(marker))
+            self.after_marker = True
+        elif tag == "ac:task-status":
+            self.param = "task-status"
+            self.skip += 1
+        elif tag in ("pre", "ac:plain-text-body"):
+            lang = self.macros[-1]["params"].get("language", "") if self.macros and tag != "pre" else ""
+            self._block()
+            self._write(f"```{lang.strip()}\n")
+            self.pre += 1
+        elif tag == "blockquote":
+            self._block()
+            self.prefixes.append("> ")
+        elif tag == "ac:structured-macro":
+            self.macros.append({"name": a.get("ac:name", ""), "params": {}, "quoted": False})
+        elif tag == "ac:rich-text-body" and self.macros:
+            macro = self.macros[-1]
+            title = macro["params"].get("title", "").strip()
+            if macro["name"] in _CALLOUTS:
+                self._block()
+                self.prefixes.append("> ")
+                macro["quoted"] = True
+                self._write(f"**{title or macro['name'].capitalize()}:** ")
+                self.after_marker = True
+            elif title:
+                self._block()
+                self._write(f"**{title}**")
+                self._block()
+        elif tag == "table":
+            self._block()
+            self.rows.append(0)
+        elif tag == "tr":
+            self._block("\n")
+            self._write("|")
+            self.row_cells = 0
+        elif tag in ("td", "th"):
+            self.cells += 1
+            self.row_cells += 1
+            self._put(" ")
+        elif tag == "time" and a.get("datetime"):
+            self._write(a["datetime"])
+        elif tag in _BLOCKS:
+            if self.after_marker:
+                return
+            self._block("\n" if self.lists else "\n\n")
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in ("br", "hr", "img") and tag not in _SKIP:
+            self.handle_endtag(tag)
+        elif tag in _SKIP:
+            self.skip -= 1
+            self.param = None
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP:
+            if self.skip:
+                self.skip -= 1
+            self.param = None
+            return
+        if tag == "ac:task-status":
+            self.skip = max(0, self.skip - 1)
+            self.param = None
+            return
+        if self.skip:
+            return
+        if tag in _HEADINGS and self.heading is not None:
+            level, parts = self.heading
+            self.heading = None
+            self._heading(level, " ".join("".join(parts).split()))
+        elif self.heading is not None:
+            return
+        elif tag in _MARKS:
+            self._write(_MARKS[tag])
+        elif tag in ("a", "ac:link") and self.links:
+            href, start = self.links.pop()
+            if self.pos == start and self.link_title:
+                self._write(self.link_title)
+            self._write(f"]({href})" if href else "]")
+        elif tag == "ac:image":
+            self._write(f"[image: {self.link_title}]" if self.link_title else "[image]")
+        elif tag in ("ul", "ol", "ac:task-list") and self.lists:
+            self.lists.pop()
+            self._block("\n" if self.lists else "\n\n")
+        elif tag in ("li", "ac:task") and self.prefixes:
+            self.prefixes.pop()
+        elif tag in ("pre", "ac:plain-text-body") and self.pre:
+            self.pre -= 1
+            self._write("\n```")
+            self._block()
+        elif tag == "blockquote" and self.prefixes:
+            self.prefixes.pop()
+            self._block()
+        elif tag == "ac:rich-text-body" and self.macros and self.macros[-1]["quoted"]:
+            self.macros[-1]["quoted"] = False
+            self.prefixes.pop()
+            self._block()
+        elif tag == "ac:structured-macro" and self.macros:
+            macro = self.macros.pop()
+            params = macro["params"]
+            if macro["name"] == "jira" and params.get("key"):
+                self._write(f"[{params['key'].strip()}]")
+            elif macro["name"] == "status" and params.get("title"):
+                self._write(f"[{params['title'].strip()}]")
+        elif tag in ("td", "th") and self.cells:
+            self.cells -= 1
+            self._put("|" if self.tail.endswith(" ") else " |")
+        elif tag == "tr" and self.rows:
+            self._put("\n")
+            self.rows[-1] += 1
+            if self.rows[-1] == 1:
+                self._put("|" + " --- |" * self.row_cells + "\n")
+        elif tag == "table" and self.rows:
+            self.rows.pop()
+            self._block()
+        elif tag in _BLOCKS and not self.lists:
+            self._block()
+
+    def handle_data(self, data: str) -> None:
+        if self.skip:
+            if self.param == "task-status":
+                self._write("[x] " if data.strip() == "complete" else "[ ] ")
+            elif self.param and self.macros:
+                params = self.macros[-1]["params"]
+                params[self.param] = params.get(self.param, "") + data
+            return
+        if self.heading is not None:
+            self.heading[1].append(data)
+            return
+        if self.pre:
+            self._write(data)
+            return
+        text = re.sub(r"\s+", " ", data)
+        if self.tail.endswith(("\n", " ")) or self.after_marker:
+            text = text.lstrip()
+        if text:
+            self._write(text)
+
+    def unknown_decl(self, data: str) -> None:
+        # Storage format keeps code and plain-text link bodies in CDATA sections
+        if data.startswith("CDATA["):
+            self.handle_data(data[len("CDATA[") :])
+
+    # ── sections ────────────────────────────────────────────────────────────
+
+    def _heading(self, level: int, title: str) -> None:
+        index = len(self.outline) + 1
+        if self.section is not None and not self.section_done:
+            if self.section_level is not None and level <= self.section_level:
+                self.keep = False
+                self.section_done = True
+            elif self.section_level is None and self.section in (title.lower(), str(index)):
+                self.keep = True
+                self.section_level = level
+        self.outline.append({"index": index, "level": level, "title": title, "start": self.pos})
+        self._write(f"{'#' * level} {title}")
+        self._block()
+
+
+def html_to_markdown(html: str, section: str | None = None, max_chars: int | None = None) -> dict:
+    """Convert HTML / Confluence storage XHTML to Markdown in one pass.
+    section selects one heading (title, case-insensitive, or its 1-based outline index) and keeps only
+    that heading and its sub-sections. max_chars bounds the kept Markdown.
+    Returns {"markdown", "outline": [{index, level, title, chars}], "found", "truncated"}."""
+    writer = _MarkdownWriter(section, max_chars)
+    for i in range(0, len(html), _FEED_CHUNK):
+        writer.feed(html[i : i + _FEED_CHUNK])
+    writer.close()
+
+    outline = writer.outline
+    for i, entry in enumerate(outline):
+        end = next((o["start"] for o in outline[i + 1 :] if o["level"] <= entry["level"]), writer.pos)
+        entry["chars"] = end - entry.pop("start")
+    return {
+        "markdown": "".join(writer.out).strip(),
+        "outline": outline,
+        "found": section is None or writer.section_level is not None,
+        "truncated": writer.truncated,
+    }
@@ -0,0 +1,474 @@
+"""Shared HTTP client for REST-backed tool categories.
+
+Keeps per-host pools of keep-alive connections (one TCP+TLS handshake per connection, not per
+call), asks for gzip, applies one default timeout, follows redirects, honours HTTP(S)_PROXY,
+and records per-host request/latency counters for mcp_health_check.
+
+Callers can opt into a per-host token-bucket rate limit and retries: 429/502/503/504 and
+transport errors are retried with exponential backoff and full jitter, honouring Retry-After.
+Only idempotent methods are retried unless the caller marks the request idempotent.
+"""
+
+import base64
+import email.utils
+import gzip
+import http.client
+import os
+import random
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from collections.abc import Iterator
+
+DEFAULT_TIMEOUT = float(os.environ.get("MCP_HTTP_TIMEOUT", "20"))
+_USER_AGENT = "cursor-tools-mcp"
+_MAX_IDLE_PER_HOST = 8
+_MAX_REDIRECTS = 5
+_STREAM_CHUNK = 64 * 1024
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_RETRY_STATUSES = {429, 502, 503, 504}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 30.0
+_MAX_RETRY_AFTER = 60.0
+# Errors meaning a pooled keep-alive connection was closed by the server while idle
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# (scheme, host, port) -> idle (ssl context, connection) pairs, oldest first
+_POOLS: dict[tuple, list[tuple]] = {}
+_POOL_LOCK = threading.Lock()
+_STATS: dict[str, dict] = {}
+_STATS_LOCK = threading.Lock()
+_DEFAULT_CONTEXT: list[ssl.SSLContext] = []
+# host -> token bucket {"tokens", "updated", "blocked_until"}; see _throttle
+_BUCKETS: dict[str, dict] = {}
+_BUCKET_LOCK = threading.Lock()
+
+
+def _default_context() -> ssl.SSLContext:
+    if not _DEFAULT_CONTEXT:
+        _DEFAULT_CONTEXT.append(ssl.create_default_context())
+    return _DEFAULT_CONTEXT[0]
+
+
+def _proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def _new_connection(key: tuple, timeout: float, context: ssl.SSLContext | None) -> http.client.HTTPConnection:
+    scheme, host, port = key
+    proxy = _proxy_for(scheme, host)
+    if proxy is None:
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=context or _default_context())
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+    if scheme == "https":
+        conn = http.client.HTTPSConnection(
+            proxy.hostname, proxy.port or 8080, timeout=timeout, context=context or _default_context()
+        )
+        tunnel_headers = {}
+        if proxy.username:
+            creds = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+            tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+        conn.set_tunnel(host, port, headers=tunnel_headers)
+        return conn
+    return http.client.HTTPConnection(proxy.hostname, proxy.port or 8080, timeout=timeout)
+
+
+def _checkout(key: tuple, context: ssl.SSLContext | None) -> http.client.HTTPConnection | None:
+    """Take the most recently used idle connection for this host that was opened with the same context."""
+    with _POOL_LOCK:
+        idle = _POOLS.get(key) or []
+        for i in range(len(idle) - 1, -1, -1):
+            if idle[i][0] is context:
+                return idle.pop(i)[1]
+    return None
+
+
+def _checkin(key: tuple, context: ssl.SSLContext | None, conn: http.client.HTTPConnection) -> None:
+    with _POOL_LOCK:
+        idle = _POOLS.setdefault(key, [])
+        idle.append((context, conn))
+        evicted = idle.pop(0)[1] if len(idle) > _MAX_IDLE_PER_HOST else None
+    if evicted is not None:
+        evicted.close()
+
+
+def _host_stats(host: str) -> dict:
+    """Counters for host; caller holds _STATS_LOCK."""
+    return _STATS.setdefault(
+        host,
+        {"requests": 0, "errors": 0, "total_ms": 0.0, "bytes": 0, "connections": 0, "retries": 0, "throttled_ms": 0.0},
+    )
+
+
+def _record(host: str, elapsed: float, size: int, error: bool, new_connection: bool) -> None:
+    with _STATS_LOCK:
+        stats = _host_stats(host)
+        stats["requests"] += 1
+        stats["errors"] += int(error)
+        stats["total_ms"] += elapsed * 1000
+        stats["bytes"] += size
+        stats["connections"] += int(new_connection)
+
+
+def _record_wait(host: str, seconds: float, retry: bool = False) -> None:
+    with _STATS_LOCK:
+        stats = _host_stats(host)
+        stats["throttled_ms"] += seconds * 1000
+        stats["retries"] += int(retry)
+
+
+def _throttle(host: str, rate: float | None) -> None:
+    """Block until host's token bucket (rate req/s, burst 2x rate) allows a request and any
+    Retry-After cooldown has passed. Tokens may go negative to reserve a slot for concurrent callers."""
+    with _BUCKET_LOCK:
+        now = time.monotonic()
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _BUCKETS[host] = {"tokens": 2 * rate if rate else 0.0, "updated": now, "blocked_until": 0.0}
+        wait = max(0.0, bucket["blocked_until"] - now)
+        if rate:
+            burst = 2 * rate
+            bucket["tokens"] = min(burst, bucket["tokens"] + (now - bucket["updated"]) * rate)
+            bucket["updated"] = now
+            bucket["tokens"] -= 1
+            if bucket["tokens"] < 0:
+                wait = max(wait, -bucket["tokens"] / rate)
+    if wait > 0:
+        time.sleep(wait)
+        _record_wait(host, wait)
+
+
+def _cooldown(host: str, seconds: float) -> None:
+    """Hold every caller for host until the server's Retry-After has passed."""
+    with _BUCKET_LOCK:
+        bucket = _BUCKETS.setdefault(host, {"tokens": 0.0, "updated": time.monotonic(), "blocked_until": 0.0})
+        bucket["blocked_until"] = max(bucket["blocked_until"], time.monotonic() + seconds)
+
+
+def _retry_after(headers: dict) -> float | None:
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return min(float(value), _MAX_RETRY_AFTER)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(0.0, when.timestamp() - time.time()), _MAX_RETRY_AFTER)
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))
+
+
+def _decode_body(body: bytes, encoding: str | None) -> bytes:
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def _route(parts: urllib.parse.SplitResult) -> tuple[tuple, str]:
+    """(pool key, request target) for a URL; plain-HTTP requests via a proxy use the absolute URL."""
+    scheme = parts.scheme.lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+    if scheme == "http" and _proxy_for(scheme, parts.hostname):
+        target = urllib.parse.urlunsplit((scheme, parts.netloc, parts.path or "/", parts.query, ""))
+    return (scheme, parts.hostname, port), target
+
+
+def _send_once(
+    method: str,
+    parts: urllib.parse.SplitResult,
+    headers: dict,
+    data: bytes | None,
+    timeout: float,
+    context: ssl.SSLContext | None,
+    resend: bool,
+) -> tuple[int, dict, bytes]:
+    """One request/response on a pooled connection. resend: whether the request may be sent again on a
+    fresh connection when a reused one turns out to be closed (the server may already have acted on it)."""
+    key, target = _route(parts)
+    conn = _checkout(key, context)
+    reused = conn is not None
+    started = time.monotonic()
+    while True:
+        if conn is None:
+            conn = _new_connection(key, timeout, context)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except _STALE_ERRORS:
+            conn.close()
+            if not reused or not resend:
+                _record(parts.hostname, time.monotonic() - started, 0, True, not reused)
+                raise
+            # The server dropped an idle pooled connection; retry once on a fresh one
+            conn, reused = None, False
+            continue
+        except Exception:
+            conn.close()
+            _record(parts.hostname, time.monotonic() - started, 0, True, not reused)
+            raise
+        break
+
+    if resp.will_close:
+        conn.close()
+    else:
+        _checkin(key, context, conn)
+    _record(parts.hostname, time.monotonic() - started, len(body), resp.status >= 400, not reused)
+    resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+    return resp.status, resp_headers, _decode_body(body, resp_headers.get("content-encoding"))
+
+
+def _follow(
+    method: str,
+    url: str,
+    headers: dict,
+    data: bytes | None,
+    timeout: float,
+    context: ssl.SSLContext | None,
+    resend: bool,
+) -> tuple[int, dict, bytes]:
+    """Send one request, following redirects (Authorization is dropped when the host changes).
+    resend is passed to _send_once; a redirect that turns the request into a GET makes it resendable."""
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        status, resp_headers, body = _send_once(method, parts, headers, data, timeout, context, resend)
+        location = resp_headers.get("location")
+        if status not in _REDIRECT_CODES or not location:
+            return status, resp_headers, body
+        next_url = urllib.parse.urljoin(url, location)
+        if urllib.parse.urlsplit(next_url).hostname != parts.hostname:
+            headers = {k: v for k, v in headers.items() if k.lower() != "authorization"}
+        if status == 303 or (status in (301, 302) and method == "POST"):
+            method, data, resend = "GET", None, True
+            headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+        url = next_url
+    return status, resp_headers, body
+
+
+def request(
+    method: str,
+    url: str,
+    headers: dict | None = None,
+    data: bytes | None = None,
+    timeout: float | None = None,
+    context: ssl.SSLContext | None = None,
+    retries: int = 0,
+    idempotent: bool | None = None,
+    rate_limit: float | None = None,
+) -> tuple[int, dict, bytes]:
+    """Send a request over a pooled keep-alive connection and return (status, headers, body).
+    Response headers are lower-cased; gzip/deflate bodies are decoded; redirects are followed.
+    rate_limit: requests/second allowed to this host (token bucket shared by all callers).
+    retries: extra attempts on 429/502/503/504 or transport errors, for idempotent methods only
+    (pass idempotent=True for read-only POSTs such as search). Transport errors that are not
+    retried raise (OSError, HTTPException); in particular a non-idempotent request is never sent twice,
+    not even when its pooled connection turns out to have been closed by the server."""
+    hdrs = {"User-Agent": _USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    hdrs.update(headers or {})
+    timeout = timeout or DEFAULT_TIMEOUT
+    host = urllib.parse.urlsplit(url).hostname or ""
+    can_retry = idempotent if idempotent is not None else method.upper() in _IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        _throttle(host, rate_limit)
+        try:
+            status, resp_headers, body = _follow(method, url, hdrs, data, timeout, context, can_retry)
+        except (OSError, http.client.HTTPException):
+            if not can_retry or attempt >= retries:
+                raise
+            delay = _backoff(attempt)
+        else:
+            if status not in _RETRY_STATUSES:
+                return status, resp_headers, body
+            server_delay = _retry_after(resp_headers)
+            if status == 429:
+                _cooldown(host, server_delay if server_delay is not None else _backoff(attempt))
+            if not can_retry or attempt >= retries:
+                return status, resp_headers, body
+            delay = server_delay if server_delay is not None else _backoff(attempt)
+        attempt += 1
+        time.sleep(delay)
+        _record_wait(host, delay, retry=True)
+
+
+def request_text(
+    method: str,
+    url: str,
+    headers: dict | None = None,
+    data: bytes | None = None,
+    timeout: float | None = None,
+    context: ssl.SSLContext | None = None,
+    error_chars: int = 600,
+    retries: int = 0,
+    idempotent: bool | None = None,
+    rate_limit: float | None = None,
+) -> tuple[bool, str]:
+    """request() in the (ok, text_or_error) shape used by the category _api helpers."""
+    try:
+        status, _, body = request(
+            method,
+            url,
+            headers=headers,
+            data=data,
+            timeout=timeout,
+            context=context,
+            retries=retries,
+            idempotent=idempotent,
+            rate_limit=rate_limit,
+        )
+    except Exception as e:
+        return False, f"Error: {e}"
+    text = body.decode("utf-8", errors="ignore")
+    if status >= 400:
+        return False, f"HTTP {status}: {text[:error_chars]}"
+    return True, text
+
+
+def stream_lines(
+    url: str,
+    headers: dict | None = None,
+    timeout: float | None = None,
+    context: ssl.SSLContext | None = None,
+    error_chars: int = 600,
+    rate_limit: float | None = None,
+) -> Iterator[str]:
+    """GET url and yield the (decoded) body line by line, without newlines, as it arrives.
+    Closing the generator early drops the connection, so large bodies are only read as far as needed;
+    a body read to the end returns its connection to the pool. Redirects are followed, nothing is
+    retried. Raises (OSError, HTTPException) on transport errors and HTTPException("HTTP <status>: ...")
+    for error responses."""
+    hdrs = {"User-Agent": _USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    hdrs.update(headers or {})
+    timeout = timeout or DEFAULT_TIMEOUT
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        _throttle(parts.hostname or "", rate_limit)
+        key, target = _route(parts)
+        conn = _checkout(key, context)
+        reused = conn is not None
+        started = time.monotonic()
+        while True:
+            if conn is None:
+                conn = _new_connection(key, timeout, context)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request("GET", target, headers=hdrs)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    _record(parts.hostname, time.monotonic() - started, 0, True, True)
+                    raise
+                # GET is idempotent, so resending on a fresh connection is safe
+                conn, reused = None, False
+                continue
+            except Exception:
+                conn.close()
+                _record(parts.hostname, time.monotonic() - started, 0, True, not reused)
+                raise
+            break
+
+        location = resp.getheader("location")
+        if (resp.status in _REDIRECT_CODES and location) or resp.status >= 400:
+            body = resp.read()
+            if resp.will_close:
+                conn.close()
+            else:
+                _checkin(key, context, conn)
+            _record(parts.hostname, time.monotonic() - started, len(body), resp.status >= 400, not reused)
+            if resp.status >= 400:
+                text = _decode_body(body, resp.getheader("content-encoding")).decode("utf-8", errors="ignore")
+                raise http.client.HTTPException(f"HTTP {resp.status}: {text[:error_chars]}")
+            next_url = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(next_url).hostname != parts.hostname:
+                hdrs = {k: v for k, v in hdrs.items() if k.lower() != "authorization"}
+            url = next_url
+            continue
+
+        encoding = (resp.getheader("content-encoding") or "").lower()
+        # wbits 47 accepts both gzip and zlib-wrapped deflate streams
+        decoder = zlib.decompressobj(47) if encoding in ("gzip", "deflate") else None
+        size = 0
+        done = False
+        pending = b""
+        try:
+            while True:
+                chunk = resp.read(_STREAM_CHUNK)
+                if not chunk:
+                    break
+                size += len(chunk)
+                pending += decoder.decompress(chunk) if decoder else chunk
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    yield line.decode("utf-8", errors="ignore")
+            if decoder:
+                pending += decoder.flush()
+            if pending:
+                yield pending.decode("utf-8", errors="ignore")
+            done = True
+        finally:
+            if done and not resp.will_close:
+                _checkin(key, context, conn)
+            else:
+                conn.close()
+            _record(parts.hostname, time.monotonic() - started, size, False, not reused)
+        return
+    raise http.client.HTTPException(f"Too many redirects: {url}")
+
+
+def atlassian_policy() -> dict:
+    """Rate limit and retry keyword arguments shared by the Jira and Confluence tools.
+    Atlassian Cloud throttles per account: cap requests/second per host (ATLASSIAN_RATE_LIMIT) and
+    retry 429/5xx, honouring Retry-After, for idempotent calls (ATLASSIAN_MAX_RETRIES). Read on each
+    call so values from .jira_env / .confluence_env, which load after this module, apply."""
+    return {
+        "rate_limit": float(os.environ.get("ATLASSIAN_RATE_LIMIT", "10")),
+        "retries": int(os.environ.get("ATLASSIAN_MAX_RETRIES", "3")),
+    }
+
+
+def get_stats() -> dict[str, dict]:
+    """Per-host counters: requests, errors, new connections, bytes, average latency,
+    retries and time spent throttled (rate limiter, Retry-After and backoff waits)."""
+    with _STATS_LOCK:
+        return {
+            host: {**s, "avg_ms": round(s["total_ms"] / s["requests"], 1) if s["requests"] else 0.0}
+            for host, s in _STATS.items()
+        }
+
+
+def format_stats() -> str:
+    stats = get_stats()
+    if not stats:
+        return "No HTTP requests yet."
+    return "\n".join(
+        f"{host}: {s['requests']} req, {s['errors']} err, {s['connections']} conn, "
+        f"avg {s['avg_ms']} ms, {s['bytes'] // 1024} KiB, {s['retries']} retries, "
+        f"throttled {round(s['throttled_ms'] / 1000, 1)} s"
+        for host, s in sorted(stats.items())
+    )
@@ -0,0 +1,357 @@
+"""Local SQLite mirror of Jira issues: storage, sync bookkeeping and a JQL-like filter compiler."""
+
+import json
+import re
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from utils import get_cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    id TEXT,
+    project TEXT,
+    summary TEXT,
+    status TEXT,
+    type TEXT,
+    priority TEXT,
+    assignee TEXT,
+    reporter TEXT,
+    labels TEXT,
+    description TEXT,
+    created TEXT,
+    updated TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_project ON issues(project);
+CREATE INDEX IF NOT EXISTS issues_status ON issues(status COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS issues_assignee ON issues(assignee COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS issues_updated ON issues(updated);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Filter fields -> SQL expressions. "text" searches summary and description together.
+_COLUMNS = {
+    "key": "key",
+    "issuekey": "key",
+    "project": "project",
+    "summary": "summary",
+    "description": "description",
+    "status": "status",
+    "type": "type",
+    "issuetype": "type",
+    "priority": "priority",
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "created": "created",
+    "updated": "updated",
+    "text": "(coalesce(summary, '') || ' ' || coalesce(description, ''))",
+}
+_DATE_FIELDS = {"created", "updated"}
+_LABEL_FIELDS = {"labels", "label"}
+# Natural order for keys (MTP-9 before MTP-10)
+_ORDER_EXPR = {"key": ("project", "CAST(substr(key, instr(key, '-') + 1) AS INTEGER)")}
+
+_TOKEN_RE = re.compile(r'\s*(?:"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'|(!=|>=|<=|!~|[=~<>(),])|([^\s"\'=~<>!(),]+))')
+_RELATIVE_RE = re.compile(r"^-(\d+)([wdhm])$")
+_RELATIVE_UNITS = {"w": "weeks", "d": "days", "h": "hours", "m": "minutes"}
+_DATE_FORMATS = ("%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y-%m-%d", "%Y/%m/%d")
+
+
+def db_path() -> Path:
+    return get_cache_dir("jira") / "mirror.sqlite3"
+
+
+def connect() -> sqlite3.Connection:
+    """Open the mirror database (created on first use). WAL lets reads run during a sync."""
+    conn = sqlite3.connect(db_path(), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def get_meta(conn: sqlite3.Connection, name: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(conn: sqlite3.Connection, name: str, value: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta(name, value) VALUES (?, ?)", (name, value))
+
+
+def to_utc(value: str | None) -> str | None:
+    """Jira timestamp ('2024-05-01T10:11:12.000+0200') -> sortable UTC 'YYYY-MM-DDTHH:MM:SS'."""
+    if not value:
+        return None
+    try:
+        ts = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return value
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def upsert_issue(
+    conn: sqlite3.Connection,
+    issue: dict,
+    project: str | None,
+    created: str | None,
+    updated: str | None,
+    synced_at: float,
+) -> None:
+    """Store one trimmed issue (the dict the tools return) plus the columns filters need."""
+    conn.execute(
+        "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            issue.get("key"),
+            issue.get("id"),
+            project,
+            issue.get("summary"),
+            issue.get("status"),
+            issue.get("type"),
+            issue.get("priority"),
+            issue.get("assignee"),
+            issue.get("reporter"),
+            json.dumps(issue.get("labels") or []),
+            issue.get("description"),
+            to_utc(created),
+            to_utc(updated),
+            json.dumps(issue),
+            synced_at,
+        ),
+    )
+
+
+def prune(conn: sqlite3.Connection, keep: set[str]) -> int:
+    """Delete issues not in keep (after a full sync). Returns the number removed."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_keys (key TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM keep_keys")
+    conn.executemany("INSERT OR IGNORE INTO keep_keys VALUES (?)", ((k,) for k in keep))
+    cur = conn.execute("DELETE FROM issues WHERE key NOT IN (SELECT key FROM keep_keys)")
+    return cur.rowcount
+
+
+def get_issue(conn: sqlite3.Connection, key: str) -> dict | None:
+    row = conn.execute("SELECT data FROM issues WHERE key = ? COLLATE NOCASE", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def count(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT count(*) FROM issues").fetchone()[0]
+
+
+def search(conn: sqlite3.Connection, query: str, limit: int) -> tuple[int, list[dict]]:
+    """Run a JQL-like filter against the mirror. Returns (total matches, first `limit` issues).
+    Raises ValueError for filters outside the supported subset."""
+    where, params, order = compile_filter(query)
+    total = conn.execute(f"SELECT count(*) FROM issues WHERE {where}", params).fetchone()[0]
+    rows = conn.execute(f"SELECT data FROM issues WHERE {where} ORDER BY {order} LIMIT ?", [*params, limit])
+    return total, [json.loads(r[0]) for r in rows]
+
+
+# ---------------------------------------------------------------------------
+# Filter compiler
+# ---------------------------------------------------------------------------
+
+
+def _tokenize(query: str) -> deque:
+    tokens: deque = deque()
+    pos = 0
+    query = query.rstrip()
+    while pos < len(query):
+        m = _TOKEN_RE.match(query, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Cannot parse filter near: {query[pos:pos + 20]!r}")
+        pos = m.end()
+        dq, sq, op, word = m.groups()
+        if dq is not None or sq is not None:
+            tokens.append(("str", re.sub(r"\\(.)", r"\1", dq if dq is not None else sq)))
+        elif op is not None:
+            tokens.append(("op", op))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+def _is_word(token: tuple | None, *words: str) -> bool:
+    return token is not None and token[0] == "word" and token[1].upper() in words
+
+
+def _date_value(value: str) -> str:
+    """'-7d' / '-2h' / '2024-05-01' / '2024-05-01 14:00' (local time) -> UTC 'YYYY-MM-DDTHH:MM:SS'."""
+    m = _RELATIVE_RE.match(value)
+    if m:
+        ts = datetime.now(timezone.utc) - timedelta(**{_RELATIVE_UNITS[m.group(2)]: int(m.group(1))})
+        return ts.strftime("%Y-%m-%dT%H:%M:%S")
+    for fmt in _DATE_FORMATS:
+        try:
+            ts = datetime.strptime(value, fmt).astimezone(timezone.utc)
+        except ValueError:
+            continue
+        return ts.strftime("%Y-%m-%dT%H:%M:%S")
+    raise ValueError(f"Unsupported date {value!r} (use -7d, -12h, YYYY-MM-DD or 'YYYY-MM-DD HH:MM').")
+
+
+def _like(value: str) -> str:
+    return "%" + value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _value(tokens: deque) -> str:
+    if not tokens or tokens[0][0] == "op":
+        raise ValueError("Expected a value.")
+    return tokens.popleft()[1]
+
+
+def _value_list(tokens: deque) -> list[str]:
+    if not tokens or tokens.popleft() != ("op", "("):
+        raise ValueError("Expected '(' after IN.")
+    values = [_value(tokens)]
+    while tokens and tokens[0] == ("op", ","):
+        tokens.popleft()
+        values.append(_value(tokens))
+    if not tokens or tokens.popleft() != ("op", ")"):
+        raise ValueError("Expected ')' to close IN list.")
+    return values
+
+
+def _clause(tokens: deque, params: list) -> str:
+    if not tokens or tokens[0][0] != "word":
+        raise ValueError("Expected a field name.")
+    field = tokens.popleft()[1].lower()
+    if field not in _COLUMNS and field not in _LABEL_FIELDS:
+        raise ValueError(f"Unknown field {field!r}. Supported: {', '.join(sorted([*_COLUMNS, 'labels']))}.")
+
+    # IS [NOT] EMPTY / NULL
+    if _is_word(tokens[0] if tokens else None, "IS"):
+        tokens.popleft()
+        negate = _is_word(tokens[0] if tokens else None, "NOT")
+        if negate:
+            tokens.popleft()
+        if not _is_word(tokens.popleft() if tokens else None, "EMPTY", "NULL"):
+            raise ValueError("Expected EMPTY after IS [NOT].")
+        if field in _LABEL_FIELDS:
+            return "labels != '[]'" if negate else "labels = '[]'"
+        col = _COLUMNS[field]
+        return f"coalesce({col}, '') != ''" if negate else f"coalesce({col}, '') = ''"
+
+    # [NOT] IN (...)
+    if _is_word(tokens[0] if tokens else None, "NOT", "IN"):
+        negate = tokens.popleft()[1].upper() == "NOT"
+        if negate and not _is_word(tokens.popleft() if tokens else None, "IN"):
+            raise ValueError("Expected IN after NOT.")
+        values = _value_list(tokens)
+        if field in _DATE_FIELDS:
+            raise ValueError("IN is not supported for dates.")
+        params.extend(values)
+        marks = ", ".join("?" * len(values))
+        if field in _LABEL_FIELDS:
+            test = f"EXISTS (SELECT 1 FROM json_each(labels) WHERE value COLLATE NOCASE IN ({marks}))"
+            return f"NOT {test}" if negate else test
+        return f"{_COLUMNS[field]} COLLATE NOCASE {'NOT IN' if negate else 'IN'} ({marks})"
+
+    if not tokens or tokens[0][0] != "op" or tokens[0][1] in "(),":
+        raise ValueError(f"Expected an operator after {field!r}.")
+    op = tokens.popleft()[1]
+    raw = _value(tokens)
+
+    if field in _LABEL_FIELDS:
+        if op not in ("=", "!="):
+            raise ValueError("labels supports =, !=, IN, NOT IN and IS [NOT] EMPTY.")
+        params.append(raw)
+        test = "EXISTS (SELECT 1 FROM json_each(labels) WHERE value = ? COLLATE NOCASE)"
+        return test if op == "=" else f"NOT {test}"
+    col = _COLUMNS[field]
+    if op in ("~", "!~"):
+        params.append(_like(raw))
+        return f"{col} {'NOT ' if op == '!~' else ''}LIKE ? ESCAPE '\\'"
+    if field == "text":
+        raise ValueError("text supports only ~ and !~.")
+    if raw.upper() in ("EMPTY", "NULL") and op in ("=", "!="):
+        return f"coalesce({col}, '') {'=' if op == '=' else '!='} ''"
+    if field in _DATE_FIELDS:
+        params.append(_date_value(raw))
+        return f"{col} {op} ?"
+    if op not in ("=", "!="):
+        raise ValueError(f"{op} is only supported for created/updated.")
+    params.append(raw)
+    return f"{col} {op} ? COLLATE NOCASE"
+
+
+def _order_by(tokens: deque) -> str:
+    if not _is_word(tokens.popleft() if tokens else None, "BY"):
+        raise ValueError("Expected BY after ORDER.")
+    parts = []
+    while True:
+        if not tokens or tokens[0][0] != "word":
+            raise ValueError("Expected a field after ORDER BY.")
+        field = tokens.popleft()[1].lower()
+        if field not in _COLUMNS or field == "text":
+            raise ValueError(f"Cannot order by {field!r}.")
+        direction = "ASC"
+        if _is_word(tokens[0] if tokens else None, "ASC", "DESC"):
+            direction = tokens.popleft()[1].upper()
+        col = _COLUMNS[field]
+        parts.extend(f"{expr} {direction}" for expr in _ORDER_EXPR.get(col, (col,)))
+        if not tokens or tokens[0] != ("op", ","):
+            break
+        tokens.popleft()
+    if tokens:
+        raise ValueError("Unexpected text after ORDER BY.")
+    return ", ".join(parts)
+
+
+def compile_filter(query: str) -> tuple[str, list, str]:
+    """Compile a JQL subset into (where_sql, params, order_sql).
+    Supports: field = / != / ~ / !~ value, field [NOT] IN (a, b), field IS [NOT] EMPTY,
+    created/updated with < <= > >= (-7d, -12h, YYYY-MM-DD), AND / OR / NOT with parentheses,
+    and ORDER BY field [ASC|DESC], ... (default: updated DESC)."""
+    tokens = _tokenize(query or "")
+    sql: list[str] = []
+    params: list = []
+    order = "updated DESC"
+    depth = 0
+    while tokens:
+        if not sql and _is_word(tokens[0], "ORDER"):
+            tokens.popleft()
+            order = _order_by(tokens)
+            break
+        while tokens and (tokens[0] == ("op", "(") or _is_word(tokens[0], "NOT")):
+            tok = tokens.popleft()
+            if tok[0] == "op":
+                sql.append("(")
+                depth += 1
+            else:
+                sql.append("NOT")
+        sql.append(_clause(tokens, params))
+        while tokens and tokens[0] == ("op", ")"):
+            tokens.popleft()
+            sql.append(")")
+            depth -= 1
+            if depth < 0:
+                raise ValueError("Unbalanced ')'.")
+        if not tokens:
+            break
+        if _is_word(tokens[0], "AND", "OR"):
+            sql.append(tokens.popleft()[1].upper())
+            if not tokens:
+                raise ValueError("Filter ends with AND/OR.")
+            continue
+        if _is_word(tokens[0], "ORDER"):
+            tokens.popleft()
+            order = _order_by(tokens)
+            break
+        raise ValueError(f"Unexpected {tokens[0][1]!r}; join conditions with AND / OR.")
+    if depth:
+        raise ValueError("Unbalanced '('.")
+    return " ".join(sql) or "1", params, order
+
+
+def age_seconds(conn: sqlite3.Connection) -> float | None:
+    """Seconds since the last successful sync, or None if the mirror was never synced."""
+    last = get_meta(conn, "last_sync")
+    return time.time() - float(last) if last else None
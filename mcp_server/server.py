@@ -9,8 +9,8 @@ Categories: docs, project_info, db, search, env, git, logs, bitbucket, postman,
 - db: list_databases, run_database_query, run_database_query_from_file, list_tables, describe_table (disable db = all db tools off)
 - search: grep_code, search_docs
 - env: get_config (read .secrets.toml, .env with sensitive values masked)
-- git: git_status, git_branches, recent_commits
-- logs: tail_logs, read_log_file (default: logs/app.log)
+- git: git_status, git_branches, recent_commits, git_show_file, git_history_stats, git_diff, git_show, git_blame
+- logs: tail_logs, read_log_file, query_logs, log_stats, log_errors (default: logs/app.log)
 """
 
 import os
@@ -28,6 +28,8 @@ if str(_path) not in __import__("sys").path:
 
 from mcp.server.fastmcp import FastMCP
 
+import http_client
+
 # Category-based toggles. Default: all. Omit a category to disable it.
 # docs, project_info, db, search, env, git, logs, bitbucket, postman, google_search, fetch, memory, jira, confluence
 _ENABLED = os.getenv(
@@ -114,6 +116,10 @@ def mcp_health_check() -> str:
         icon = "🟢" if _enabled(cat) else "⚪"
         status.append(f"{icon} {cat}")
 
+    # 3. Shared HTTP client (per-host requests, connections opened, latency)
+    status.append("\nHTTP:")
+    status.append(http_client.format_stats())
+
     return "\n".join(status)
 
 
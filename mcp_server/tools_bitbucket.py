@@ -1,15 +1,19 @@
 """Bitbucket category: repos, projects, PRs, issues, files."""
 
 import base64
+import hashlib
 import json
 import os
-import urllib.error
+import re
+import threading
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 _MCP_DIR = Path(__file__).resolve().parent
-from utils import get_project_root, load_env_file
+import http_client
+from diff_utils import iter_file_diffs, page_file_diffs, skip_hunks
+from utils import get_cache_dir, get_project_root, load_env_file
 
 PROJECT_ROOT = get_project_root()
 
@@ -25,6 +29,24 @@ BITBUCKET_WORKSPACE="your_workspace"  # Default Optional
 # Load mcp_server/.bitbucket_env into os.environ
 load_env_file(".bitbucket_env", _MCP_DIR, _BITBUCKET_ENV_TEMPLATE)
 
+# Parallel requests used to fetch the remaining pages of a list endpoint
+_PAGE_CONCURRENCY = int(os.environ.get("BITBUCKET_PAGE_CONCURRENCY", "4"))
+
+# bitbucket_get_file keeps file contents per (repo, commit, path) on disk; least recently read
+# files are evicted once the cache grows past this size.
+_FILE_CACHE_BYTES = int(float(os.environ.get("BITBUCKET_FILE_CACHE_MB", "100")) * 1024 * 1024)
+_FULL_HASH = re.compile(r"^[0-9a-f]{40}$")
+_SHORT_HASH = re.compile(r"^[0-9a-f]{7,39}$")
+# Resolved commit hashes of abbreviated hashes (immutable) and repository main branch names
+_RESOLVED: dict[tuple[str, str, str], str] = {}
+_MAIN_BRANCHES: dict[tuple[str, str], str] = {}
+_FILE_CACHE_LOCK = threading.Lock()
+
+# PR diffs: files listed in the stat summary of bitbucket_get_pr_diff, and files requested per
+# page (passed to the diff endpoint as path parameters, so earlier/unselected files are not downloaded)
+_STAT_LIST_LIMIT = 100
+_DIFF_PAGE_FILES = 50
+
 
 def _get_auth_headers() -> tuple[dict, str | None]:
     """Build auth header from env. Returns (headers, error)."""
@@ -77,16 +99,13 @@ def _api_json(method: str, path_or_url: str, params: dict | None = None, body: d
     if body is not None:
         data = json.dumps(body).encode("utf-8")
         headers["Content-Type"] = "application/json"
-    req = urllib.request.Request(url, data=data, method=method, headers=headers)
+    ok, text = http_client.request_text(method, url, headers=headers, data=data, error_chars=500)
+    if not ok:
+        return False, text
+    if not text:
+        return True, {}
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            text = resp.read().decode("utf-8", errors="ignore")
-        if not text:
-            return True, {}
         return True, json.loads(text)
-    except urllib.error.HTTPError as e:
-        msg = e.read().decode("utf-8", errors="ignore")
-        return False, f"HTTP {e.code}: {msg[:500]}"
     except Exception as e:
         return False, f"Error: {e}"
 
@@ -97,25 +116,36 @@ def _api_text(method: str, path_or_url: str):
     headers, err = _get_auth_headers()
     if err:
         return False, err
-    req = urllib.request.Request(url, method=method, headers=headers)
-    try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            text = resp.read().decode("utf-8", errors="ignore")
-        return True, text
-    except urllib.error.HTTPError as e:
-        msg = e.read().decode("utf-8", errors="ignore")
-        return False, f"HTTP {e.code}: {msg[:500]}"
-    except Exception as e:
-        return False, f"Error: {e}"
+    return http_client.request_text(method, url, headers=headers, error_chars=500)
 
 
 def _fetch_values(path: str, params: dict | None = None, max_pages: int = 5) -> tuple[bool, list | str]:
-    """Fetch paginated values from a Bitbucket list endpoint."""
+    """Fetch paginated values from a Bitbucket list endpoint.
+    The first page reports size and pagelen, so the remaining pages are requested concurrently by
+    page number and joined in order. Endpoints without a size (cursor paged) follow next links."""
     ok, data = _api_json("GET", path, params=params)
     if not ok:
         return False, data
     values = list(data.get("values", []))
     next_url = data.get("next")
+    size = data.get("size")
+    pagelen = data.get("pagelen") or len(values)
+    if not next_url or max_pages <= 1:
+        return True, values
+
+    if isinstance(size, int) and pagelen:
+        last = min(max_pages, -(-size // pagelen))
+        page_params = {**(params or {}), "pagelen": pagelen}
+        with ThreadPoolExecutor(max_workers=max(1, min(_PAGE_CONCURRENCY, last - 1))) as pool:
+            pages = list(
+                pool.map(lambda n: _api_json("GET", path, params={**page_params, "page": n}), range(2, last + 1))
+            )
+        for ok, page in pages:
+            if not ok:
+                return False, page
+            values.extend(page.get("values", []))
+        return True, values
+
     pages = 1
     while next_url and pages < max_pages:
         ok, page = _api_json("GET", next_url)
@@ -127,6 +157,138 @@ def _fetch_values(path: str, params: dict | None = None, max_pages: int = 5) ->
     return True, values
 
 
+def _resolve_commit(workspace: str, repo_slug: str, ref: str) -> str | None:
+    """Commit hash a ref points to now. Full hashes need no request, abbreviated hashes are resolved
+    once; branches and tags cost one small request each time (HEAD is the repository's main branch)."""
+    ref = ref.strip()
+    if _FULL_HASH.match(ref):
+        return ref
+    key = (workspace, repo_slug, ref)
+    if key in _RESOLVED:
+        return _RESOLVED[key]
+    repo = f"/repositories/{workspace}/{repo_slug}"
+    if ref == "HEAD":
+        if (workspace, repo_slug) not in _MAIN_BRANCHES:
+            ok, data = _api_json("GET", repo, params={"fields": "mainbranch.name"})
+            name = ((data.get("mainbranch") or {}).get("name") if ok else None) or ""
+            if not name:
+                return None
+            _MAIN_BRANCHES[(workspace, repo_slug)] = name
+        ref = _MAIN_BRANCHES[(workspace, repo_slug)]
+    ok, data = _api_json("GET", f"{repo}/commit/{urllib.parse.quote(ref, safe='')}", params={"fields": "hash"})
+    commit = data.get("hash") if ok else None
+    if not commit or not _FULL_HASH.match(commit):
+        return None
+    if _SHORT_HASH.match(ref) and commit.startswith(ref):
+        _RESOLVED[key] = commit
+    return commit
+
+
+def _file_cache_path(workspace: str, repo_slug: str, commit: str, file_path: str) -> Path:
+    key = hashlib.sha1(f"{workspace}/{repo_slug}:{file_path}".encode()).hexdigest()[:16]
+    return get_cache_dir("bitbucket_files") / f"{commit}-{key}"
+
+
+def _store_file(cache_file: Path, text: str) -> None:
+    """Write a cached file, then evict least recently read files beyond _FILE_CACHE_BYTES."""
+    with _FILE_CACHE_LOCK:
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(cache_file)
+        entries = []
+        for f in cache_file.parent.iterdir():
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, f))
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries, key=lambda e: e[0]):
+            if total <= _FILE_CACHE_BYTES:
+                break
+            if f != cache_file:
+                f.unlink(missing_ok=True)
+                total -= size
+
+
+def _get_file(workspace: str, repo_slug: str, file_path: str, ref: str) -> tuple[bool, str]:
+    """Raw file content at ref, read from the disk cache when that commit's copy is already there."""
+    safe_path = urllib.parse.quote(file_path.strip("/"))
+    commit = _resolve_commit(workspace, repo_slug, ref)
+    if commit is None:
+        # Unresolvable ref (or no network): let the src endpoint interpret it, uncached
+        return _api_text("GET", f"/repositories/{workspace}/{repo_slug}/src/{ref}/{safe_path}")
+    cache_file = _file_cache_path(workspace, repo_slug, commit, file_path.strip("/"))
+    try:
+        text = cache_file.read_text(encoding="utf-8")
+        os.utime(cache_file)  # mark as recently used
+        return True, text
+    except OSError:
+        pass
+    ok, text = _api_text("GET", f"/repositories/{workspace}/{repo_slug}/src/{commit}/{safe_path}")
+    if ok:
+        try:
+            _store_file(cache_file, text)
+        except OSError:
+            pass
+    return ok, text
+
+
+def _pr_diffstat(workspace: str, repo_slug: str, pr_id: int, max_pages: int = 10) -> tuple[bool, list | str]:
+    """Per-file change counts of a pull request from the diffstat endpoint (no diff text)."""
+    ok, values = _fetch_values(
+        f"/repositories/{workspace}/{repo_slug}/pullrequests/{pr_id}/diffstat",
+        params={"pagelen": 500},
+        max_pages=max_pages,
+    )
+    if not ok:
+        return False, values
+    rows = []
+    for entry in values:
+        new = (entry.get("new") or {}).get("path")
+        old = (entry.get("old") or {}).get("path")
+        row = {
+            "path": new or old,
+            "status": entry.get("status"),
+            "added": entry.get("lines_added") or 0,
+            "removed": entry.get("lines_removed") or 0,
+        }
+        if old and new and old != new:
+            row["old_path"] = old
+        rows.append(row)
+    return True, rows
+
+
+def _stream_diff(path: str, params: dict | None = None):
+    """Yield lines of a diff endpoint as they arrive; closing the generator stops the download."""
+    headers, err = _get_auth_headers()
+    if err:
+        raise PermissionError(err)
+    url = f"{_BASE_URL}{path}"
+    if params:
+        url = f"{url}?{urllib.parse.urlencode(params, doseq=True)}"
+    yield from http_client.stream_lines(url, headers=headers, error_chars=500)
+
+
+def _pr_diff_lines(workspace: str, repo_slug: str, pr_id: int, paths: list[str]):
+    """Stream a pull request's diff limited to paths. The PR diff endpoint only redirects to the
+    repository diff of source..destination (topic=true), so that diff is requested directly with
+    one path parameter per file; the PR endpoint is the fallback when the commits are unknown."""
+    repo = f"/repositories/{workspace}/{repo_slug}"
+    ok, pr = _api_json(
+        "GET", f"{repo}/pullrequests/{pr_id}", params={"fields": "source.commit.hash,destination.commit.hash"}
+    )
+    source = ((pr.get("source") or {}).get("commit") or {}).get("hash") if ok else None
+    dest = ((pr.get("destination") or {}).get("commit") or {}).get("hash") if ok else None
+    if source and dest:
+        return _stream_diff(f"{repo}/diff/{source}..{dest}", {"topic": "true", "path": paths})
+    return _stream_diff(f"{repo}/pullrequests/{pr_id}/diff", {"path": paths})
+
+
+def _path_selected(path: str, prefixes: list[str]) -> bool:
+    return any(path == p or path.startswith(p.rstrip("/") + "/") for p in prefixes)
+
+
 def _trim_repo(repo: dict) -> dict:
     project = repo.get("project") or {}
     return {
@@ -229,6 +391,126 @@ def register(mcp, enabled_fn):
             return data
         return json.dumps(_trim_pr(data), indent=2)
 
+    @mcp.tool()
+    def bitbucket_get_pr_diffstat(workspace: str, repo_slug: str, pr_id: int) -> str:
+        """Files changed by a pull request with added/removed line counts, without downloading the diff."""
+        if not enabled_fn("bitbucket"):
+            return "Tool disabled. Enable 'bitbucket' in CURSOR_TOOLS_ENABLED."
+        ok, rows = _pr_diffstat(workspace, repo_slug, pr_id)
+        if not ok:
+            return rows
+        result = {
+            "files_changed": len(rows),
+            "lines_added": sum(r["added"] for r in rows),
+            "lines_removed": sum(r["removed"] for r in rows),
+            "files": rows,
+        }
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    def bitbucket_get_pr_diff(
+        workspace: str,
+        repo_slug: str,
+        pr_id: int,
+        paths: str | None = None,
+        file_offset: int = 0,
+        max_bytes: int = 20000,
+        hunk_offset: int = 0,
+    ) -> str:
+        """Size-bounded pull request diff: stat totals first, then whole-file diffs up to max_bytes.
+        Only the files of the requested page are downloaded, streamed until the page is full.
+        paths: comma-separated files or directories to include. Page with file_offset and hunk_offset
+        (the response tells you the next ones; hunk_offset continues a file too large for one page).
+        Example: bitbucket_get_pr_diff('ws', 'backend-api', 42, paths='app/pricing')
+        """
+        if not enabled_fn("bitbucket"):
+            return "Tool disabled. Enable 'bitbucket' in CURSOR_TOOLS_ENABLED."
+        selected = [p.strip().strip("/") for p in (paths or "").split(",") if p.strip().strip("/")]
+        ok, rows = _pr_diffstat(workspace, repo_slug, pr_id)
+        if not ok:
+            return rows
+        if selected:
+            rows = [r for r in rows if _path_selected(r["path"], selected)]
+        if not rows:
+            return "No changes." if not selected else f"No changes under {', '.join(selected)}."
+        added = sum(r["added"] for r in rows)
+        removed = sum(r["removed"] for r in rows)
+        out = [f"{len(rows)} file(s) changed, +{added} -{removed}"]
+        for r in rows[:_STAT_LIST_LIMIT]:
+            name = f"{r['old_path']} -> {r['path']}" if "old_path" in r else r["path"]
+            status = f" ({r['status']})" if r["status"] and r["status"] != "modified" else ""
+            out.append(f"  +{r['added']} -{r['removed']}  {name}{status}")
+        if len(rows) > _STAT_LIST_LIMIT:
+            out.append(f"  ... and {len(rows) - _STAT_LIST_LIMIT} more file(s)")
+
+        # Only this page's files are requested. Diffs are matched to their diffstat rows by path and
+        # paged in diffstat order, so a file the server leaves out or returns out of order cannot
+        # shift or skip later files
+        window = rows[max(0, file_offset) : max(0, file_offset) + _DIFF_PAGE_FILES]
+        if not window:
+            out.append(f"\nNo file diffs at file_offset={file_offset}.")
+            return "\n".join(out)
+        position: dict[str, int] = {}  # path (new or old) -> index in window
+        for i, r in enumerate(window):
+            position.setdefault(r["path"], i)
+            if "old_path" in r:
+                position.setdefault(r["old_path"], i)
+        lines = _pr_diff_lines(workspace, repo_slug, pr_id, sorted(position))
+        order: list[int] = []  # window index of each diff handed to page_file_diffs
+
+        def file_diffs():
+            # Diffs arriving ahead of an earlier file are held back until that file arrives
+            pending: dict[int, tuple[str, list[str]]] = {}
+            expected = 0
+            for p, chunk in iter_file_diffs(lines):
+                i = position.get(p)
+                if i is None or i < expected or i in pending:
+                    continue
+                pending[i] = (p, chunk)
+                while expected in pending:
+                    order.append(expected)
+                    yield _continued(expected, *pending.pop(expected))
+                    expected += 1
+            for i in sorted(pending):
+                order.append(i)
+                yield _continued(i, *pending[i])
+
+        def _continued(i: int, p: str, chunk: list[str]) -> tuple[str, list[str]]:
+            # hunk_offset belongs to the file at file_offset, which may be missing from the stream
+            return p, skip_hunks(chunk, hunk_offset) if i == 0 and hunk_offset else chunk
+
+        try:
+            page, next_in_stream, next_hunk = page_file_diffs(file_diffs(), 0, max_bytes)
+        except Exception as e:
+            return "\n".join(out + ["", str(e) if str(e).startswith("HTTP") else f"Error: {e}"])
+        finally:
+            lines.close()
+        if next_in_stream is None:
+            resume = len(window)
+        elif next_in_stream < len(order):
+            resume = order[next_in_stream]
+            if next_hunk and resume == 0:
+                next_hunk += hunk_offset
+        else:  # the last diff was cut to fit and the next one was not read yet
+            resume = order[-1] + 1
+        next_offset = file_offset + resume if file_offset + resume < len(rows) else None
+        if not page:
+            out.append(f"\nNo file diffs at file_offset={file_offset}.")
+            return "\n".join(out)
+        last = min(resume + 1 if next_hunk else resume, len(window))  # the cut file counts as shown
+        out.append(f"\nFiles {file_offset + 1}-{file_offset + last} of {len(rows)}")
+        if next_offset is not None:
+            out[-1] += f" — next page: file_offset={next_offset}"
+            if next_hunk:
+                out[-1] += f", hunk_offset={next_hunk}"
+        shown = set(order[: next_in_stream + 1 if next_hunk else next_in_stream])
+        missing = [window[i]["path"] for i in range(last) if i not in shown]
+        if missing:
+            out.append(f"No diff returned for: {', '.join(missing)}")
+        out.append("")
+        out.extend(page)
+        return "\n".join(out)
+
     @mcp.tool()
     def bitbucket_create_pull_request(
         workspace: str,
@@ -294,11 +576,11 @@ def register(mcp, enabled_fn):
 
     @mcp.tool()
     def bitbucket_get_file(workspace: str, repo_slug: str, file_path: str, ref: str = "HEAD") -> str:
-        """Get raw file content from a repository."""
+        """Get raw file content from a repository.
+        ref may be a branch, tag or commit hash (HEAD = main branch). Contents are cached on disk per
+        commit, so a pinned commit is downloaded once; branch refs cost one small lookup per call.
+        """
         if not enabled_fn("bitbucket"):
             return "Tool disabled. Enable 'bitbucket' in CURSOR_TOOLS_ENABLED."
-        safe_path = urllib.parse.quote(file_path.strip("/"))
-        ok, text = _api_text("GET", f"/repositories/{workspace}/{repo_slug}/src/{ref}/{safe_path}")
-        if not ok:
-            return text
+        ok, text = _get_file(workspace, repo_slug, file_path, ref)
         return text
@@ -3,13 +3,21 @@
 import base64
 import json
 import os
-import urllib.error
+import re
+import sqlite3
+import threading
+import time
 import urllib.parse
-import urllib.request
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 _MCP_DIR = Path(__file__).resolve().parent
-from utils import get_project_root, load_env_file
+import confluence_mirror
+import http_client
+from adf_utils import adf_to_markdown
+from html_utils import html_to_markdown
+from utils import get_cache_dir, get_project_root, load_env_file
 
 PROJECT_ROOT = get_project_root()
 
@@ -18,6 +26,7 @@ _CONFLUENCE_ENV_TEMPLATE = """
 # CONFLUENCE_EMAIL="your_email@example.com"
 # CONFLUENCE_API_TOKEN="your_confluence_api_token"
 # CONFLUENCE_HOST="https://your-domain.atlassian.net"
+# CONFLUENCE_MIRROR_SPACES="MTP,DEV"  # Optional: spaces kept in the offline search mirror
 """
 
 # Load mcp_server/.jira_env and .confluence_env into os.environ (sharing auth by default but allowing overrides)
@@ -26,6 +35,16 @@ _CONFLUENCE_ENV_TEMPLATE = """
 load_env_file(".jira_env", _MCP_DIR, "")
 load_env_file(".confluence_env", _MCP_DIR, _CONFLUENCE_ENV_TEMPLATE)
 
+# Offline mirror (confluence_mirror.py): spaces synced by default, how stale a mirrored search may be
+# before it syncs first, and the v2 list page size used while syncing.
+_MIRROR_SPACES = [k.strip() for k in os.environ.get("CONFLUENCE_MIRROR_SPACES", "").split(",") if k.strip()]
+_MIRROR_MAX_AGE = int(os.environ.get("CONFLUENCE_MIRROR_MAX_AGE", "3600"))
+_MIRROR_PAGE_SIZE = 100
+_MIRROR_LOCK = threading.Lock()
+
+# CQL search page size (the v1 search endpoint caps pages at 50 when excerpts are included)
+_SEARCH_PAGE_SIZE = 50
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -70,16 +89,175 @@ def _api(method: str, path: str, body: dict | None = None, params: dict | None =
         url = f"{url}?{query}"
 
     data = json.dumps(body).encode() if body is not None else None
-    req = urllib.request.Request(url, data=data, method=method, headers=headers)
-    try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            text = resp.read().decode("utf-8", errors="ignore")
+    ok, text = http_client.request_text(method, url, headers=headers, data=data, **http_client.atlassian_policy())
+    if ok:
         return True, text or "{}"
-    except urllib.error.HTTPError as e:
-        msg = e.read().decode("utf-8", errors="ignore")
-        return False, f"HTTP {e.code}: {msg[:600]}"
-    except Exception as e:
-        return False, f"Error: {e}"
+    return False, text
+
+
+def _get_page_with_body(page_id: str, body_format: str) -> tuple[bool, dict | str, bool]:
+    """Fetch a page with its body, reusing a disk copy of the body while the version is unchanged.
+    A body-less GET reads the current version first; the body is only downloaded on a cache miss.
+    Returns (ok, page_or_error, served_from_cache)."""
+    ok, raw = _api("GET", f"/pages/{page_id}")
+    if not ok:
+        return False, raw, False
+    page = json.loads(raw)
+    cache_dir = get_cache_dir("confluence_pages")
+    safe_id = re.sub(r"\W", "_", str(page_id))
+    version = (page.get("version") or {}).get("number")
+    cache_file = cache_dir / f"{safe_id}-v{version}.{body_format}"
+    if version is not None and cache_file.exists():
+        page["body"] = {body_format: {"representation": body_format, "value": cache_file.read_text(encoding="utf-8")}}
+        return True, page, True
+
+    ok, raw = _api("GET", f"/pages/{page_id}", params={"body-format": body_format})
+    if not ok:
+        return False, raw, False
+    page = json.loads(raw)
+    # The page may have been edited between the two calls: key the copy by the version it came with
+    version = (page.get("version") or {}).get("number")
+    value = ((page.get("body") or {}).get(body_format) or {}).get("value")
+    if version is not None and value is not None:
+        for old in cache_dir.glob(f"{safe_id}-v*.{body_format}"):
+            old.unlink(missing_ok=True)
+        cache_file = cache_dir / f"{safe_id}-v{version}.{body_format}"
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(value, encoding="utf-8")
+        tmp.replace(cache_file)
+    return True, page, False
+
+
+def _mirrored_page(page_id: str) -> tuple[str, str] | None:
+    try:
+        conn = confluence_mirror.connect()
+        try:
+            return confluence_mirror.page_text(conn, str(page_id))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def _get_url(url: str) -> tuple[bool, str]:
+    headers, err = _get_auth_headers()
+    if err:
+        return False, err
+    return http_client.request_text("GET", url, headers=headers, **http_client.atlassian_policy())
+
+
+def _cursor_pages(
+    path: str, params: dict | None = None, max_items: int | None = None, prefetch: bool = True
+) -> Iterator[tuple[bool, dict | str]]:
+    """Yield (ok, response_or_error) for each page of a v1 or v2 list endpoint (path relative to /wiki),
+    following _links.next until max_items results were returned. Unless prefetch is off, the next page
+    is requested in the background while the caller processes the current one; iteration stops after
+    the first error."""
+    host, err = _get_host()
+    if err:
+        yield False, err
+        return
+    url = f"{host}/wiki{path}"
+    if params:
+        url = f"{url}?{urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})}"
+
+    seen = 0
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(_get_url, url)
+        while pending is not None:
+            ok, raw = pending.result()
+            pending = None
+            if not ok:
+                yield False, raw
+                return
+            data = json.loads(raw or "{}")
+            results = data.get("results", [])
+            seen += len(results)
+            # v2 links are host-relative (/wiki/api/v2/...), v1 links are relative to /wiki
+            next_link = (data.get("_links") or {}).get("next")
+            if next_link and not next_link.startswith("http"):
+                next_link = host + (next_link if next_link.startswith("/wiki/") else f"/wiki{next_link}")
+            more = bool(next_link and results and (max_items is None or seen < max_items))
+            if more and prefetch:
+                pending = pool.submit(_get_url, next_link)
+            yield True, data
+            if more and not prefetch:
+                pending = pool.submit(_get_url, next_link)
+
+
+def _page_url(page: dict) -> str:
+    host = (os.environ.get("CONFLUENCE_HOST") or os.environ.get("JIRA_HOST", "")).rstrip("/")
+    webui = (page.get("_links") or {}).get("webui", "")
+    return f"{host}/wiki{webui}" if webui else ""
+
+
+def _mirror_space(conn: sqlite3.Connection, key: str, full: bool) -> tuple[bool, str]:
+    """Sync one space: walk its pages newest-modified first, re-index pages whose version changed and
+    stop at the first page older than the previous sync. A full sync walks everything and prunes."""
+    space_id, last_sync, last_modified = confluence_mirror.get_space(conn, key)
+    if not space_id:
+        ok, raw = _api("GET", "/spaces", params={"keys": key})
+        if not ok:
+            return False, f"{key}: {raw}"
+        results = json.loads(raw).get("results", [])
+        if not results:
+            return False, f"{key}: space not found."
+        space_id = str(results[0].get("id"))
+    full = full or last_sync is None
+    started = time.time()
+    known = confluence_mirror.page_versions(conn, key)
+    seen: set[str] = set()
+    indexed = 0
+    newest = last_modified
+    params = {"limit": _MIRROR_PAGE_SIZE, "sort": "-modified-date", "body-format": "storage", "status": "current"}
+    # Incremental syncs usually stop within the first page, so only full walks fetch ahead
+    for ok, data in _cursor_pages(f"/api/v2/spaces/{space_id}/pages", params, prefetch=full):
+        if not ok:
+            conn.rollback()
+            return False, f"{key}: {data}"
+        reached_old = False
+        for page in data.get("results", []):
+            version = page.get("version") or {}
+            modified = version.get("createdAt") or ""
+            # ISO-8601 UTC timestamps from the API compare correctly as strings
+            if not full and last_modified and modified and modified < last_modified:
+                reached_old = True
+                break
+            newest = max(newest or "", modified) or None
+            page_id = str(page.get("id"))
+            seen.add(page_id)
+            if known.get(page_id) == version.get("number"):
+                continue
+            body = ((page.get("body") or {}).get("storage") or {}).get("value", "")
+            confluence_mirror.upsert_page(
+                conn,
+                page_id,
+                key,
+                page.get("title", ""),
+                version.get("number"),
+                modified,
+                _page_url(page),
+                html_to_markdown(body)["markdown"] if body else "",
+            )
+            indexed += 1
+        if reached_old:
+            break
+    removed = confluence_mirror.prune(conn, key, seen) if full else 0
+    confluence_mirror.set_space(conn, key, space_id, started, newest)
+    conn.commit()
+    kind = "full" if full else "incremental"
+    return True, f"{key}: {kind} sync, {indexed} page(s) indexed, {removed} removed ({time.time() - started:.1f}s)."
+
+
+def _mirror_sync(spaces: list[str], full: bool = False) -> tuple[bool, str]:
+    """Sync the given spaces into the mirror. Returns (all succeeded, one line per space)."""
+    with _MIRROR_LOCK:
+        conn = confluence_mirror.connect()
+        try:
+            results = [_mirror_space(conn, key, full) for key in spaces]
+        finally:
+            conn.close()
+    return all(ok for ok, _ in results), "\n".join(msg for _, msg in results)
 
 
 # ---------------------------------------------------------------------------
@@ -87,10 +265,21 @@ def _api(method: str, path: str, body: dict | None = None, params: dict | None =
 # ---------------------------------------------------------------------------
 
 
-def _trim_page(page: dict) -> dict:
+def _trim_page(page: dict, preview: bool = True) -> dict:
+    """Page summary with a 1500-character Markdown preview of the body. preview=False skips the
+    conversion for callers that render the body themselves (content is left empty)."""
     host = (os.environ.get("CONFLUENCE_HOST") or os.environ.get("JIRA_HOST", "")).rstrip("/")
     body = page.get("body", {})
     storage = body.get("storage") or body.get("view") or body.get("atlas_doc_format") or {}
+    raw_value = storage.get("value", "")
+    is_adf = "atlas_doc_format" in body and "storage" not in body
+    # Preview as Markdown within the same budget (ADF bodies arrive as a JSON string)
+    if not raw_value or not preview:
+        content = ""
+    elif is_adf:
+        content = adf_to_markdown(raw_value, 1500)
+    else:
+        content = html_to_markdown(raw_value, max_chars=1500)["markdown"]
 
     # Optional parent fields if expanded
 
@@ -101,9 +290,9 @@ def _trim_page(page: dict) -> dict:
         "created": page.get("createdAt"),
         "version": (page.get("version") or {}).get("number", 1),
         "url": f"{host}/wiki{page.get('_links', {}).get('webui', '')}" if "_links" in page else "",
-        "content_type": "storage/html" if "storage" in body else "adf",
-        "content_length": len(storage.get("value", "")),
-        "content": storage.get("value", "")[:1500] if storage.get("value") else "",  # Trimmed representation
+        "content_type": "adf/markdown" if is_adf else "storage/markdown",
+        "content_length": len(raw_value),
+        "content": content,  # Trimmed representation
     }
 
 
@@ -131,32 +320,84 @@ def register(mcp, enabled_fn):  # noqa: ANN001
     # ── READ ────────────────────────────────────────────────────────────────
 
     @mcp.tool()
-    def confluence_get_page(page_id: str, include_content: bool = True) -> str:
+    def confluence_get_page(
+        page_id: str,
+        include_content: bool = True,
+        body_format: str = "storage",
+        as_markdown: bool = True,
+        section: str | None = None,
+        outline_only: bool = False,
+        max_chars: int = 0,
+    ) -> str:
         """Get full details and content of a Confluence page by its ID.
-        Example: confluence_get_page('123456789')
+        body_format: 'storage' (XHTML, default) or 'atlas_doc_format' (returned rendered as Markdown)
+        as_markdown: convert storage XHTML to Markdown (False returns the raw XHTML)
+        outline_only: return the heading outline (index, level, title, chars) instead of content
+        section: return only that heading and its sub-sections (title or outline index)
+        max_chars: cap the returned content (0 = no cap)
+        Bodies are cached on disk per page version; an unchanged page costs one small version check.
+        Examples:
+          confluence_get_page('123456789', outline_only=True)
+          confluence_get_page('123456789', section='Deployment')
         """
         if not enabled_fn("confluence"):
             return "Tool disabled. Add 'confluence' to CURSOR_TOOLS_ENABLED."
+        if body_format not in ("storage", "atlas_doc_format"):
+            return "body_format must be 'storage' or 'atlas_doc_format'."
 
-        params = {"body-format": "storage"} if include_content else {}
-        ok, raw = _api("GET", f"/pages/{page_id}", params=params)
-        if not ok:
-            return raw
-
-        data = json.loads(raw)
-        trimmed = _trim_page(data)
+        if not include_content:
+            ok, raw = _api("GET", f"/pages/{page_id}")
+            if not ok:
+                return raw
+            return json.dumps(_trim_page(json.loads(raw)), indent=2)
 
-        # If they explicitly wanted content, don't trim it
-        if include_content:
-            body = data.get("body", {})
-            storage = body.get("storage", {})
-            trimmed["content"] = storage.get("value", "")
+        ok, data, from_cache = _get_page_with_body(page_id, body_format)
+        if not ok:
+            mirrored = _mirrored_page(page_id)
+            if mirrored is None:
+                return data
+            # Offline: fall back to the mirrored text (Markdown) of the page
+            title, text = mirrored
+            limit = max_chars if max_chars > 0 else None
+            return json.dumps(
+                {"id": page_id, "title": title, "content": text[:limit] if limit else text, "from_mirror": True},
+                indent=2,
+            )
+        # The body is rendered below, so skip the preview conversion
+        trimmed = _trim_page(data, preview=False)
+        trimmed["from_cache"] = from_cache
+        limit = max_chars if max_chars > 0 else None
+
+        # If they explicitly wanted content, don't trim it (beyond max_chars)
+        value = (data.get("body", {}).get(body_format) or {}).get("value", "")
+        if body_format == "atlas_doc_format":
+            trimmed["content"] = adf_to_markdown(value, limit) if value else ""
+        elif as_markdown or section or outline_only:
+            converted = html_to_markdown(value, section=section, max_chars=limit)
+            if outline_only:
+                trimmed.pop("content")
+                trimmed["outline"] = converted["outline"]
+            elif not converted["found"]:
+                return json.dumps(
+                    {"error": f"Section '{section}' not found.", "outline": converted["outline"]},
+                    indent=2,
+                )
+            else:
+                trimmed["content_type"] = "storage/markdown"
+                trimmed["content"] = converted["markdown"]
+                trimmed["truncated"] = converted["truncated"]
+                if section:
+                    trimmed["section"] = section
+        else:
+            trimmed["content_type"] = "storage/html"
+            trimmed["content"] = value[:limit] if limit else value
 
         return json.dumps(trimmed, indent=2)
 
     @mcp.tool()
     def confluence_search_pages(cql: str, limit: int = 15) -> str:
-        """Search Confluence using Confluence Query Language (CQL).
+        """Search Confluence using Confluence Query Language (CQL). Follows result pages until limit
+        results are returned; has_more reports whether more matches exist.
         Examples:
           confluence_search_pages('type=page AND text ~ "architecture"')
           confluence_search_pages('space="MTP" AND title ~ "Meeting Notes"')
@@ -164,25 +405,94 @@ def register(mcp, enabled_fn):  # noqa: ANN001
         if not enabled_fn("confluence"):
             return "Tool disabled. Add 'confluence' to CURSOR_TOOLS_ENABLED."
 
-        # Confluence search is on v1 API
-        host, err = _get_host()
-        if err:
-            return err
-        headers, err = _get_auth_headers()
-        if err:
-            return err
-
-        url = f"{host}/wiki/rest/api/search?cql={urllib.parse.quote(cql)}&limit={limit}"
-        req = urllib.request.Request(url, method="GET", headers=headers)
-
+        # Confluence search is on v1 API; its pages are chained with _links.next cursors
+        limit = max(1, limit)
+        params = {"cql": cql, "limit": min(_SEARCH_PAGE_SIZE, limit)}
+        results: list[dict] = []
+        total = None
+        has_more = False
+        error = None
         try:
-            with urllib.request.urlopen(req, timeout=20) as resp:
-                text = resp.read().decode("utf-8", errors="ignore")
-            data = json.loads(text or "{}")
-            results = [_trim_search_result(r) for r in data.get("results", [])]
-            return json.dumps({"totalSize": data.get("totalSize"), "results": results}, indent=2)
+            for ok, data in _cursor_pages("/rest/api/search", params, max_items=limit):
+                if not ok:
+                    if not results:
+                        return f"Search error: {data}"
+                    error = data
+                    break
+                if total is None:
+                    total = data.get("totalSize")
+                page = data.get("results", [])
+                taken = page[: limit - len(results)]
+                results.extend(_trim_search_result(r) for r in taken)
+                has_more = bool((data.get("_links") or {}).get("next")) or len(page) > len(taken)
         except Exception as e:
             return f"Search error: {e}"
+        result: dict = {"totalSize": total, "returned": len(results), "has_more": has_more, "results": results}
+        if error:
+            result["error"] = error
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    def confluence_mirror_sync(spaces: str | None = None, full: bool = False) -> str:
+        """Mirror Confluence spaces locally for offline full-text search (comma-separated space keys).
+        Defaults to CONFLUENCE_MIRROR_SPACES, then to the spaces already mirrored. Only pages changed
+        since the last sync are fetched; full=True re-walks the space and drops deleted pages.
+        Example: confluence_mirror_sync('MTP')
+        """
+        if not enabled_fn("confluence"):
+            return "Tool disabled. Add 'confluence' to CURSOR_TOOLS_ENABLED."
+        keys = [k.strip() for k in (spaces or "").split(",") if k.strip()] or _MIRROR_SPACES
+        if not keys:
+            conn = confluence_mirror.connect()
+            try:
+                keys = [s["space"] for s in confluence_mirror.list_spaces(conn)]
+            finally:
+                conn.close()
+        if not keys:
+            return "No spaces to mirror. Pass spaces='MTP' or set CONFLUENCE_MIRROR_SPACES in .confluence_env."
+        return _mirror_sync(keys, full)[1]
+
+    @mcp.tool()
+    def confluence_mirror_search(
+        query: str,
+        spaces: str | None = None,
+        limit: int = 10,
+        max_age_seconds: int | None = None,
+    ) -> str:
+        """Full-text search (BM25) over locally mirrored Confluence spaces; milliseconds, no CQL.
+        Plain words match any term, best matches first; FTS5 syntax ("exact phrase", AND, OR, NOT,
+        prefix*) is also accepted. Spaces older than max_age_seconds (default CONFLUENCE_MIRROR_MAX_AGE)
+        are synced first; if that fails the existing mirror is searched anyway.
+        Example: confluence_mirror_search('deployment rollback', spaces='MTP')
+        """
+        if not enabled_fn("confluence"):
+            return "Tool disabled. Add 'confluence' to CURSOR_TOOLS_ENABLED."
+        wanted = [k.strip() for k in (spaces or "").split(",") if k.strip()]
+        limit_age = _MIRROR_MAX_AGE if max_age_seconds is None else max_age_seconds
+        conn = confluence_mirror.connect()
+        try:
+            mirrored = confluence_mirror.list_spaces(conn)
+            scope = wanted or [s["space"] for s in mirrored] or _MIRROR_SPACES
+            if not scope:
+                return "Nothing mirrored yet. Run confluence_mirror_sync('MTP') first."
+            ages = {s["space"]: s["age_seconds"] for s in mirrored}
+            stale = [k for k in scope if ages.get(k) is None or ages[k] > limit_age]
+            sync_error = None
+            if stale:
+                ok, msg = _mirror_sync(stale)
+                if not ok:
+                    sync_error = msg
+            try:
+                results = confluence_mirror.search(conn, query, scope, max(1, limit))
+            except sqlite3.OperationalError as e:
+                return f"Search error: {e}"
+            mirrored = [s for s in confluence_mirror.list_spaces(conn) if s["space"] in scope]
+        finally:
+            conn.close()
+        result: dict = {"spaces": mirrored, "results": results}
+        if sync_error:
+            result["sync_error"] = sync_error
+        return json.dumps(result, indent=2)
 
     # ── WRITE ───────────────────────────────────────────────────────────────
 
@@ -249,6 +559,9 @@ def register(mcp, enabled_fn):  # noqa: ANN001
         IMPORTANT: You must provide the exact NEXT `version_number`.
         If the page is currently on version 2, you must pass version_number=3.
         Use confluence_get_page to check the current version before updating.
+        The body is stored as-is as storage XHTML: to edit existing content, read it with
+        confluence_get_page(page_id, as_markdown=False) and send back edited XHTML. Sending the Markdown
+        that confluence_get_page returns by default would replace the page's formatting with raw Markdown.
         Example: confluence_update_page('123456789', 'Updated Title', '<p>New content</p>', 3)
         """
         if not enabled_fn("confluence"):
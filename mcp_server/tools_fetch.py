@@ -1,5 +1,9 @@
 """Fetch MCP tools (Wrapper for official npx server)."""
 
+import re
+
+import http_client
+
 _DISABLED_MSG = "Tool disabled. Enable 'fetch' in CURSOR_TOOLS_ENABLED."
 
 
@@ -29,27 +33,25 @@ def register(mcp, enabled_fn):
         # I will implement a robust native Python version that mimics it but is faster.
 
         try:
-            import re
-            import urllib.request
-
             headers = {"User-Agent": "Mozilla/5.0"}
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req) as response:
-                html = response.read().decode("utf-8", errors="ignore")
-
-                # Simple HTML to Markdown conversion logic
-                # 1. Title
-                title_match = re.search(r"<title>(.*?)</title>", html, re.I)
-                title = title_match.group(1) if title_match else url
-
-                # 2. Body content extraction (very basic for now)
-                # Strip scripts and styles
-                html = re.sub(r"<(script|style).*?>.*?</\1>", "", html, flags=re.S | re.I)
-                # Strip all other tags
-                text = re.sub(r"<.*?>", " ", html)
-                # Cleanup whitespace
-                text = re.sub(r"\s+", " ", text).strip()
-
-                return f"# {title}\n\nContent (Retrieved from {url}):\n\n{text[:5000]}..."  # Limit to first 5000 chars
+            status, _, body = http_client.request("GET", url, headers=headers)
+            if status >= 400:
+                return f"Error fetching URL: HTTP {status}"
+            html = body.decode("utf-8", errors="ignore")
+
+            # Simple HTML to Markdown conversion logic
+            # 1. Title
+            title_match = re.search(r"<title>(.*?)</title>", html, re.I)
+            title = title_match.group(1) if title_match else url
+
+            # 2. Body content extraction (very basic for now)
+            # Strip scripts and styles
+            html = re.sub(r"<(script|style).*?>.*?</\1>", "", html, flags=re.S | re.I)
+            # Strip all other tags
+            text = re.sub(r"<.*?>", " ", html)
+            # Cleanup whitespace
+            text = re.sub(r"\s+", " ", text).strip()
+
+            return f"# {title}\n\nContent (Retrieved from {url}):\n\n{text[:5000]}..."  # Limit to first 5000 chars
         except Exception as e:
             return f"Error fetching URL: {str(e)}"
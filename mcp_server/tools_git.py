@@ -1,10 +1,24 @@
-"""Git category: git_status, git_branches, recent_commits."""
+"""Git category: git_status, git_branches, recent_commits, git_show_file, git_history_stats, git_diff, git_show,
+git_blame."""
 
+import atexit
+import hashlib
+import heapq
+import json
+import os
+import re
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from itertools import combinations
 from pathlib import Path
 
 _MCP_DIR = Path(__file__).resolve().parent
-from utils import get_project_root
+from diff_utils import iter_file_diffs, page_file_diffs
+from utils import get_cache_dir, get_project_root
 
 PROJECT_ROOT = get_project_root()
 
@@ -28,15 +42,530 @@ def _run_git(args: list[str]) -> str:
         return "git command timed out"
 
 
+def _bad_rev(*revs: str) -> str | None:
+    """Error message for a caller-supplied revision git would parse as an option (e.g. --output=...).
+    Revisions are also passed after --end-of-options; this gives a readable error instead."""
+    for rev in revs:
+        if rev.startswith("-"):
+            return f"Invalid revision: {rev!r}"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Persistent `git cat-file --batch*` processes
+# Object, file-at-revision and history lookups are served over long-lived pipes so each
+# lookup skips process start-up, repository discovery and index loading. Any pipe failure
+# drops the process; callers then fall back to a one-shot _run_git.
+# ---------------------------------------------------------------------------
+
+_BATCH_PROCS: dict[str, subprocess.Popen] = {}
+_BATCH_LOCK = threading.Lock()
+_ABBREV: list[int] = []
+
+
+def _batch_proc(mode: str) -> subprocess.Popen:
+    proc = _BATCH_PROCS.get(mode)
+    if proc is None or proc.poll() is not None:
+        proc = subprocess.Popen(
+            ["git", "cat-file", mode],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        _BATCH_PROCS[mode] = proc
+    return proc
+
+
+def _close_batch_procs() -> None:
+    for proc in _BATCH_PROCS.values():
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+    _BATCH_PROCS.clear()
+
+
+atexit.register(_close_batch_procs)
+
+
+def _batch_query(mode: str, spec: str) -> tuple[str, str, bytes | int] | None:
+    """Send one object spec to a batch process.
+    mode '--batch' returns (sha, type, content); '--batch-check' returns (sha, type, size).
+    Returns None when the object is missing or the pipe is unusable."""
+    if "\n" in spec:
+        return None
+    with _BATCH_LOCK:
+        try:
+            proc = _batch_proc(mode)
+            proc.stdin.write(spec.encode() + b"\n")
+            proc.stdin.flush()
+            header = proc.stdout.readline().decode(errors="ignore").split()
+            if len(header) != 3:
+                # "<spec> missing" / "<spec> ambiguous"
+                return None
+            sha, obj_type, size = header[0], header[1], int(header[2])
+            if mode == "--batch-check":
+                return sha, obj_type, size
+            content = proc.stdout.read(size)
+            proc.stdout.read(1)  # trailing LF
+            return sha, obj_type, content
+        except (OSError, ValueError):
+            proc = _BATCH_PROCS.pop(mode, None)
+            if proc is not None:
+                proc.kill()
+            return None
+
+
+def _object_info(spec: str) -> tuple[str, str, int] | None:
+    """Resolve spec (e.g. 'HEAD', 'main:src/app.py') to (sha, type, size)."""
+    return _batch_query("--batch-check", spec)
+
+
+def _read_object(spec: str) -> tuple[str, str, bytes] | None:
+    """Read an object's content, e.g. a file at a revision via 'REV:path'."""
+    return _batch_query("--batch", spec)
+
+
+def _parse_commit(sha: str, raw: bytes) -> dict:
+    headers, _, message = raw.decode("utf-8", errors="replace").partition("\n\n")
+    commit = {"sha": sha, "parents": [], "author": "", "time": 0, "subject": message.split("\n", 1)[0]}
+    for line in headers.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "parent":
+            commit["parents"].append(value)
+        elif key == "author":
+            commit["author"] = value.rsplit(" ", 2)[0]
+        elif key == "committer":
+            commit["time"] = int(value.rsplit(" ", 2)[1])
+    return commit
+
+
+def _abbrev_len() -> int:
+    """Abbreviation length git itself would use (core.abbrev auto-scales with repo size)."""
+    if not _ABBREV:
+        short = _run_git(["rev-parse", "--short", "HEAD"])
+        _ABBREV.append(len(short) if short and " " not in short else 7)
+    return _ABBREV[0]
+
+
+def _log_via_batch(rev: str, n: int) -> list[dict] | None:
+    """Walk history from rev newest-first by committer date (like `git log`) using the batch pipe."""
+    start = _read_object(rev)
+    if start is None:
+        return None
+    sha, obj_type, content = start
+    if obj_type != "commit":
+        return None
+    heap = [(0, sha, _parse_commit(sha, content))]
+    seen = {sha}
+    commits: list[dict] = []
+    while heap and len(commits) < n:
+        commit = heapq.heappop(heap)[2]
+        commits.append(commit)
+        for parent in commit["parents"]:
+            if parent in seen:
+                continue
+            seen.add(parent)
+            obj = _read_object(parent)
+            if obj is None:
+                return None
+            parsed = _parse_commit(parent, obj[2])
+            heapq.heappush(heap, (-parsed["time"], parent, parsed))
+    return commits
+
+
+# ---------------------------------------------------------------------------
+# git_status: porcelain v2 + untracked cache / fsmonitor, memoized per session
+# ---------------------------------------------------------------------------
+
+# Reuse a parsed status while the index and HEAD are unchanged and it is younger than this.
+_STATUS_TTL = float(os.environ.get("GIT_STATUS_CACHE_SECONDS", "2"))
+_STATUS_CACHE: dict = {}
+
+
+def _status_config() -> list[str]:
+    """Per-invocation config so big trees avoid a full walk, without editing the user's git config.
+    The builtin fsmonitor daemon is only available on macOS and Windows."""
+    args = ["-c", "core.untrackedCache=true"]
+    if sys.platform in ("darwin", "win32"):
+        args += ["-c", "core.fsmonitor=true"]
+    return args
+
+
+def _git_dir() -> Path | None:
+    if "git_dir" not in _STATUS_CACHE:
+        out = _run_git(["rev-parse", "--absolute-git-dir"])
+        _STATUS_CACHE["git_dir"] = Path(out) if out.startswith("/") or ":" in out[:3] else None
+    return _STATUS_CACHE["git_dir"]
+
+
+def _status_fingerprint() -> tuple | None:
+    git_dir = _git_dir()
+    if git_dir is None:
+        return None
+    stamps = []
+    for name in ("index", "HEAD"):
+        try:
+            stamps.append((git_dir / name).stat().st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def _parse_status_v2(raw: str) -> dict:
+    """Parse `git status --porcelain=v2 --branch -z` output."""
+    report = {"branch": None, "oid": None, "upstream": None, "ahead": 0, "behind": 0}
+    report.update({"staged": [], "unstaged": [], "untracked": [], "conflicts": []})
+    records = iter(raw.split("\0"))
+    for rec in records:
+        if not rec:
+            continue
+        if rec.startswith("# "):
+            key, _, value = rec[2:].partition(" ")
+            if key == "branch.head":
+                report["branch"] = value
+            elif key == "branch.oid":
+                report["oid"] = value
+            elif key == "branch.upstream":
+                report["upstream"] = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                report["ahead"], report["behind"] = int(ahead), -int(behind)
+        elif rec.startswith("? "):
+            report["untracked"].append(rec[2:])
+        elif rec.startswith("u "):
+            report["conflicts"].append(rec.split(" ", 10)[10])
+        elif rec.startswith(("1 ", "2 ")):
+            fields = rec.split(" ", 9 if rec[0] == "2" else 8)
+            xy, path = fields[1], fields[-1]
+            if rec[0] == "2":
+                # With -z the rename/copy source follows as its own record
+                path = f"{next(records, '')} -> {path}"
+            if xy[0] != ".":
+                report["staged"].append(f"{xy[0]} {path}")
+            if xy[1] != ".":
+                report["unstaged"].append(f"{xy[1]} {path}")
+    return report
+
+
+def _format_status(report: dict) -> str:
+    branch = report["branch"] or "(unknown)"
+    line = f"## {branch}"
+    if report["upstream"]:
+        line += f"...{report['upstream']} [ahead {report['ahead']}, behind {report['behind']}]"
+    lines = [line]
+    for title, key in (
+        ("Conflicts", "conflicts"),
+        ("Staged", "staged"),
+        ("Unstaged", "unstaged"),
+        ("Untracked", "untracked"),
+    ):
+        if report[key]:
+            lines.append(f"{title} ({len(report[key])}):")
+            lines.extend(f"  {entry}" for entry in report[key])
+    if len(lines) == 1:
+        lines.append("Working tree clean.")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# git_history_stats: one streamed `git log --numstat` pass, cached by the commits the range resolves to
+# ---------------------------------------------------------------------------
+
+_HISTORY_CACHE: dict[tuple, str] = {}
+_HISTORY_CACHE_SIZE = 32
+_HISTORY_TIMEOUT = 120
+# Commits touching more files than this (mass renames, formatting sweeps) are left out of co-change pairs
+_COCHANGE_MAX_FILES = 30
+
+
+def _range_key(rev_range: str) -> tuple[str, ...] | None:
+    """Commits a revision range resolves to (e.g. B and ^A for A..B), or None if it does not resolve."""
+    out = _run_git(["rev-parse", rev_range])
+    shas = tuple(out.split())
+    if not shas or not all(re.fullmatch(r"\^?[0-9a-f]{40,64}", sha) for sha in shas):
+        return None
+    return shas
+
+
+def _history_stats(rev_range: str, since: str | None, path: str | None, top: int) -> str:
+    args = ["git", "log", "--numstat", "--no-renames", "--format=%x1e%H%x1f%an%x1f%ct"]
+    if since:
+        args.append(f"--since={since}")
+    args += ["--end-of-options", rev_range, "--"]
+    if path:
+        args.append(path)
+    # stderr goes to a file so a chatty git cannot block on a full pipe while stdout is streamed
+    stderr = tempfile.TemporaryFile(mode="w+")
+    try:
+        proc = subprocess.Popen(args, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, stderr=stderr, text=True)
+    except FileNotFoundError:
+        stderr.close()
+        return "git not found"
+    timed_out = threading.Event()
+
+    def expire() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(_HISTORY_TIMEOUT, expire)
+    timer.start()
+    try:
+        result = _collect_history(proc, rev_range, since, path, top)
+        returncode = proc.wait()
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        timer.cancel()
+        stderr.seek(0)
+        error = stderr.read()
+        stderr.close()
+    if timed_out.is_set():
+        return f"git log timed out after {_HISTORY_TIMEOUT}s"
+    if returncode != 0:
+        return error or "git log failed"
+    return result
+
+
+def _collect_history(proc: subprocess.Popen, rev_range: str, since: str | None, path: str | None, top: int) -> str:
+    files: dict[str, list[int]] = {}
+    dirs: dict[str, list[int]] = {}
+    authors: dict[str, list[int]] = {}
+    pairs: Counter = Counter()
+    commits = 0
+    first_ts = last_ts = None
+
+    def flush(author: str | None, touched: list[str], churn: int) -> None:
+        if author is None:
+            return
+        stats = authors.setdefault(author, [0, 0])
+        stats[0] += 1
+        stats[1] += churn
+        for name in {n.rsplit("/", 1)[0] if "/" in n else "." for n in touched}:
+            dirs[name][0] += 1
+        if 1 < len(touched) <= _COCHANGE_MAX_FILES:
+            pairs.update(combinations(sorted(touched), 2))
+
+    author, touched, churn = None, [], 0
+    for line in proc.stdout:
+        line = line.rstrip("\n")
+        if line.startswith("\x1e"):
+            flush(author, touched, churn)
+            _, author, ts = line[1:].split("\x1f")
+            ts = int(ts)
+            first_ts = ts if first_ts is None else min(first_ts, ts)
+            last_ts = ts if last_ts is None else max(last_ts, ts)
+            touched, churn = [], 0
+            commits += 1
+        elif line:
+            added, deleted, name = line.split("\t", 2)
+            added = int(added) if added.isdigit() else 0
+            deleted = int(deleted) if deleted.isdigit() else 0
+            touched.append(name)
+            churn += added + deleted
+            file_stats = files.setdefault(name, [0, 0, 0])
+            file_stats[0] += 1
+            dir_stats = dirs.setdefault(name.rsplit("/", 1)[0] if "/" in name else ".", [0, 0, 0])
+            for stats in (file_stats, dir_stats):
+                stats[1] += added
+                stats[2] += deleted
+    flush(author, touched, churn)
+
+    def ranked(table: dict) -> list[dict]:
+        rows = sorted(table.items(), key=lambda item: item[1][1] + item[1][2], reverse=True)[:top]
+        return [{"path": k, "commits": v[0], "added": v[1], "deleted": v[2]} for k, v in rows]
+
+    return json.dumps(
+        {
+            "range": rev_range,
+            "since": since,
+            "path": path,
+            "commits": commits,
+            "first": time.strftime("%Y-%m-%d", time.localtime(first_ts)) if first_ts else None,
+            "last": time.strftime("%Y-%m-%d", time.localtime(last_ts)) if last_ts else None,
+            "files": ranked(files),
+            "directories": ranked(dirs),
+            "authors": [
+                {"author": k, "commits": v[0], "churn": v[1]}
+                for k, v in sorted(authors.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            ],
+            "co_changes": [{"files": list(pair), "commits": n} for pair, n in pairs.most_common(top) if n > 1],
+        },
+        indent=2,
+    )
+
+
+# ---------------------------------------------------------------------------
+# git_diff / git_show: stat totals first, then file diffs paged under a byte budget
+# ---------------------------------------------------------------------------
+
+_STAT_LIST_LIMIT = 100
+
+
+def _stream_git_lines(args: list[str]):
+    """Yield stdout lines of a git command; closing the generator kills the process early."""
+    proc = subprocess.Popen(
+        ["git"] + args,
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+    )
+    try:
+        for line in proc.stdout:
+            yield line.rstrip("\n")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+def _diff_report(
+    stat_args: list[str], patch_args: list[str], file_offset: int, max_bytes: int, hunk_offset: int = 0
+) -> str:
+    """Render `--numstat` totals, then one page of per-file patches from a streamed diff."""
+    raw = _run_git(stat_args)
+    rows = []
+    for line in raw.splitlines():
+        parts = line.split("\t", 2)
+        if len(parts) != 3 or not (parts[0].isdigit() or parts[0] == "-"):
+            return raw
+        rows.append(parts)
+    if not rows:
+        return "No changes."
+    added = sum(int(a) for a, _, _ in rows if a.isdigit())
+    deleted = sum(int(d) for _, d, _ in rows if d.isdigit())
+    out = [f"{len(rows)} file(s) changed, +{added} -{deleted}"]
+    out += [f"  +{a} -{d}  {name}" for a, d, name in rows[:_STAT_LIST_LIMIT]]
+    if len(rows) > _STAT_LIST_LIMIT:
+        out.append(f"  ... and {len(rows) - _STAT_LIST_LIMIT} more file(s)")
+
+    lines = _stream_git_lines(["--no-pager"] + patch_args)
+    try:
+        page, next_offset, next_hunk = page_file_diffs(
+            iter_file_diffs(lines), file_offset, max_bytes, hunk_offset=hunk_offset
+        )
+    except FileNotFoundError:
+        return "git not found"
+    finally:
+        lines.close()
+    if not page:
+        out.append(f"\nNo file diffs at file_offset={file_offset}.")
+        return "\n".join(out)
+    out.append(f"\nFiles {file_offset + 1}-{file_offset + len(page)} of {len(rows)}")
+    if next_offset is not None:
+        out[-1] += f" — next page: file_offset={next_offset}"
+        if next_hunk:
+            out[-1] += f", hunk_offset={next_hunk}"
+    out.append("")
+    out.extend(page)
+    return "\n".join(out)
+
+
+def _split_paths(paths: str | None) -> list[str]:
+    return [p.strip() for p in (paths or "").split(",") if p.strip()]
+
+
+# ---------------------------------------------------------------------------
+# git_blame: full-file blame cached on disk per (path, blob sha)
+# ---------------------------------------------------------------------------
+
+
+def _parse_blame_porcelain(raw: str) -> list[dict]:
+    """Parse `git blame --porcelain` into runs of consecutive lines from the same commit."""
+    commits: dict[str, dict] = {}
+    runs: list[dict] = []
+    sha = None
+    final_line = 0
+    for line in raw.splitlines():
+        if line.startswith("\t"):
+            if runs and runs[-1]["sha"] == sha and runs[-1]["end"] == final_line - 1:
+                runs[-1]["end"] = final_line
+            else:
+                runs.append({"sha": sha, "start": final_line, "end": final_line})
+            continue
+        parts = line.split(" ")
+        if len(parts) >= 3 and len(parts[0]) == 40 and parts[1].isdigit():
+            sha, final_line = parts[0], int(parts[2])
+            commits.setdefault(sha, {})
+        elif sha and parts[0] in ("author", "author-time", "summary"):
+            commits[sha][parts[0]] = line.split(" ", 1)[1] if " " in line else ""
+    for run in runs:
+        meta = commits.get(run["sha"], {})
+        run["author"] = meta.get("author", "")
+        run["date"] = time.strftime("%Y-%m-%d", time.localtime(int(meta.get("author-time", 0))))
+        run["summary"] = meta.get("summary", "")
+    return runs
+
+
+def _blame_runs(path: str, rev: str) -> tuple[list[dict] | None, str]:
+    """Return (runs, blob sha) for path at rev, from the disk cache when the blob is unchanged."""
+    obj = _object_info(f"{rev}:{path}")
+    if obj is None:
+        return None, f"{path} not found at {rev}."
+    blob_sha, obj_type, _ = obj
+    if obj_type != "blob":
+        return None, f"{path} is a {obj_type}, not a file."
+    cache_file = get_cache_dir("git_blame") / f"{blob_sha}-{hashlib.sha1(path.encode()).hexdigest()[:12]}.json"
+    if cache_file.exists():
+        try:
+            return json.loads(cache_file.read_text()), blob_sha
+        except ValueError:
+            pass
+    try:
+        r = subprocess.run(
+            ["git", "blame", "--porcelain", rev, "--", path],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            errors="replace",
+            timeout=120,
+        )
+    except subprocess.TimeoutExpired:
+        return None, "git blame timed out"
+    if r.returncode != 0:
+        return None, r.stderr or "git blame failed"
+    runs = _parse_blame_porcelain(r.stdout)
+    tmp = cache_file.with_suffix(".tmp")
+    tmp.write_text(json.dumps(runs))
+    tmp.replace(cache_file)
+    return runs, blob_sha
+
+
 def register(mcp, enabled_fn):
     """Register git tools. Disabled when 'git' category is off."""
 
     @mcp.tool()
-    def git_status() -> str:
-        """Show git status (modified, staged, untracked files)."""
+    def git_status(refresh: bool = False) -> str:
+        """Show git status: branch, ahead/behind upstream, staged, unstaged, untracked and conflicted files.
+        Repeated calls within a few seconds reuse the last result while the index and HEAD are unchanged;
+        pass refresh=True to force a new scan.
+        """
         if not enabled_fn("git"):
             return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED (e.g. docs,project_info,db,search,env,git)."
-        return _run_git(["status", "--short"])
+        fingerprint = _status_fingerprint()
+        cached = _STATUS_CACHE.get("status")
+        now = time.monotonic()
+        if (
+            not refresh
+            and cached
+            and fingerprint is not None
+            and cached["fingerprint"] == fingerprint
+            and now - cached["at"] < _STATUS_TTL
+        ):
+            return cached["text"]
+        raw = _run_git(_status_config() + ["status", "--porcelain=v2", "--branch", "-z"])
+        if not raw.startswith("# "):
+            return raw
+        text = _format_status(_parse_status_v2(raw))
+        # Status may have refreshed the index; fingerprint after the run so the next call hits the cache
+        _STATUS_CACHE["status"] = {"fingerprint": _status_fingerprint(), "at": time.monotonic(), "text": text}
+        return text
 
     @mcp.tool()
     def git_branches() -> str:
@@ -46,8 +575,173 @@ def register(mcp, enabled_fn):
         return _run_git(["branch", "-a"])
 
     @mcp.tool()
-    def recent_commits(n: int = 10) -> str:
-        """Show recent n commits (default 10). Format: hash short message."""
+    def recent_commits(n: int = 10, rev: str = "HEAD") -> str:
+        """Show recent n commits (default 10) reachable from rev. Format: hash short message."""
+        if not enabled_fn("git"):
+            return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED."
+        if err := _bad_rev(rev):
+            return err
+        commits = _log_via_batch(rev, n)
+        if commits is None:
+            return _run_git(["log", "-n", str(n), "--oneline", "--end-of-options", rev, "--"])
+        abbrev = _abbrev_len()
+        return "\n".join(f"{c['sha'][:abbrev]} {c['subject']}" for c in commits)
+
+    @mcp.tool()
+    def git_show_file(file_path: str, rev: str = "HEAD", max_bytes: int = 200_000) -> str:
+        """Show a file's content at a revision (branch, tag or commit), without checking it out.
+        Example: git_show_file('backend/app/main.py', rev='main~3')
+        """
+        if not enabled_fn("git"):
+            return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED."
+        if err := _bad_rev(rev):
+            return err
+        spec = f"{rev}:{file_path.strip('/')}"
+        obj = _read_object(spec)
+        if obj is None:
+            text = _run_git(["show", "--end-of-options", spec])
+        elif obj[1] != "blob":
+            return f"{spec} is a {obj[1]}, not a file."
+        else:
+            text = obj[2].decode("utf-8", errors="replace")
+        if len(text) > max_bytes:
+            return text[:max_bytes] + f"\n... (truncated at {max_bytes} of {len(text)} characters)"
+        return text
+
+    @mcp.tool()
+    def git_history_stats(
+        since: str | None = None,
+        rev_range: str = "HEAD",
+        path: str | None = None,
+        top: int = 15,
+    ) -> str:
+        """Commit history analytics from a single `git log --numstat` pass.
+        Returns churn (lines added/deleted) per file and directory, commits per author,
+        and files that change together. Results are cached per resolved commit range.
+        since: git date, e.g. '3 months ago' or '2026-01-01'. rev_range: e.g. 'v1.2..HEAD'.
+        path: limit to a path, e.g. 'backend/app/pricing'.
+        Example: git_history_stats(since='6 months ago', path='backend/app/pricing')
+        """
+        if not enabled_fn("git"):
+            return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED."
+        if err := _bad_rev(rev_range):
+            return err
+        commits = _range_key(rev_range)
+        key = (commits, since, rev_range, path, top)
+        if commits and key in _HISTORY_CACHE:
+            return _HISTORY_CACHE[key]
+        result = _history_stats(rev_range, since, path, top)
+        if commits and result.startswith("{"):
+            if len(_HISTORY_CACHE) >= _HISTORY_CACHE_SIZE:
+                _HISTORY_CACHE.pop(next(iter(_HISTORY_CACHE)))
+            _HISTORY_CACHE[key] = result
+        return result
+
+    @mcp.tool()
+    def git_diff(
+        rev_range: str | None = None,
+        staged: bool = False,
+        since: str | None = None,
+        paths: str | None = None,
+        file_offset: int = 0,
+        max_bytes: int = 20000,
+        context_lines: int = 3,
+        hunk_offset: int = 0,
+    ) -> str:
+        """Size-bounded git diff: stat totals first, then whole-file diffs up to max_bytes.
+        Default: working tree vs HEAD. staged=True: index vs HEAD. rev_range: e.g. 'main...HEAD' or 'abc123 def456'.
+        since: diff from the last commit before this date to HEAD, e.g. '2 days ago' (not with rev_range).
+        paths: comma-separated pathspecs. Page with file_offset and hunk_offset (the response tells you
+        the next ones; hunk_offset continues a file too large for one page).
+        Example: git_diff(rev_range='main...HEAD', paths='backend/app/pricing')
+        """
+        if not enabled_fn("git"):
+            return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED."
+        if since and rev_range:
+            return "Pass either since or rev_range, not both."
+        if since:
+            base = _run_git(["rev-list", "-1", f"--before={since}", "HEAD"])
+            if not base or " " in base:
+                return base or f"No commit before {since}."
+            revs = [base, "HEAD"]
+        elif rev_range:
+            revs = rev_range.split()
+            if err := _bad_rev(*revs):
+                return err
+        else:
+            revs = [] if staged else ["HEAD"]
+        mode = ["--cached"] if staged and not since else []
+        revs = mode + ["--end-of-options"] + revs
+        pathspec = ["--"] + _split_paths(paths)
+        return _diff_report(
+            ["diff", "--numstat"] + revs + pathspec,
+            ["diff", "--no-color", "--no-ext-diff", f"-U{context_lines}"] + revs + pathspec,
+            file_offset,
+            max_bytes,
+            hunk_offset,
+        )
+
+    @mcp.tool()
+    def git_show(
+        rev: str = "HEAD",
+        paths: str | None = None,
+        file_offset: int = 0,
+        max_bytes: int = 20000,
+        context_lines: int = 3,
+        hunk_offset: int = 0,
+    ) -> str:
+        """Show a commit: message and stat totals first, then whole-file diffs up to max_bytes.
+        paths: comma-separated pathspecs. Page with file_offset and hunk_offset (the response tells you
+        the next ones; hunk_offset continues a file too large for one page).
+        Example: git_show('abc1234', paths='backend/app/pricing')
+        """
+        if not enabled_fn("git"):
+            return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED."
+        if err := _bad_rev(rev):
+            return err
+        fmt = "--format=commit %H%nAuthor: %an <%ae>%nDate:   %ad%n%n%B"
+        header = _run_git(["show", "-s", fmt, "--end-of-options", rev, "--"])
+        if not header.startswith("commit "):
+            return header
+        pathspec = ["--"] + _split_paths(paths)
+        opts = ["--format=", "--no-color", "--no-ext-diff", f"-U{context_lines}", "--end-of-options", rev]
+        report = _diff_report(
+            ["show", "--numstat", "--format=", "--end-of-options", rev] + pathspec,
+            ["show"] + opts + pathspec,
+            file_offset,
+            max_bytes,
+            hunk_offset,
+        )
+        return f"{header}\n\n{report}"
+
+    @mcp.tool()
+    def git_blame(file_path: str, start_line: int | None = None, end_line: int | None = None, rev: str = "HEAD") -> str:
+        """Who last touched each line, grouped by commit. Optionally limit to start_line..end_line.
+        Blame results are cached on disk per (path, blob sha), so repeated blame of an unchanged file is instant.
+        Example: git_blame('backend/app/pricing/engine.py', 120, 180)
+        """
         if not enabled_fn("git"):
             return "Tool disabled. Enable 'git' in CURSOR_TOOLS_ENABLED."
-        return _run_git(["log", "-n", str(n), "--oneline"])
+        if err := _bad_rev(rev):
+            return err
+        path = file_path.strip("/")
+        runs, blob_or_err = _blame_runs(path, rev)
+        if runs is None:
+            return blob_or_err
+        lo = start_line or 1
+        hi = end_line or (runs[-1]["end"] if runs else 0)
+        groups: dict[str, dict] = {}
+        for run in runs:
+            start, end = max(run["start"], lo), min(run["end"], hi)
+            if start > end:
+                continue
+            group = groups.setdefault(run["sha"], {**run, "ranges": []})
+            group["ranges"].append(f"L{start}" if start == end else f"L{start}-{end}")
+        if not groups:
+            return f"No lines in range {lo}-{hi} of {path}."
+        abbrev = _abbrev_len()
+        out = [f"{path} @ {rev} (blob {blob_or_err[:abbrev]}), lines {lo}-{hi}:"]
+        for sha, g in groups.items():
+            out.append(f"{sha[:abbrev]} {g['date']} {g['author']}: {g['summary'][:80]}")
+            out.append(f"    {', '.join(g['ranges'])}")
+        return "\n".join(out)
@@ -3,10 +3,10 @@
 import json
 import os
 import urllib.parse
-import urllib.request
 from pathlib import Path
 
 _MCP_DIR = Path(__file__).resolve().parent
+import http_client
 from utils import get_project_root, load_env_file
 
 PROJECT_ROOT = get_project_root()
@@ -43,18 +43,18 @@ def register(mcp, enabled_fn):
             safe_query = urllib.parse.quote(query)
             url = f"https://www.googleapis.com/customsearch/v1?key={api_key}&cx={cx}&q={safe_query}"
 
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode())
+            ok, text = http_client.request_text("GET", url)
+            if not ok:
+                return f"Error performing Google Search: {text}"
+            data = json.loads(text)
 
-                if "items" not in data:
-                    return "No results found."
+            if "items" not in data:
+                return "No results found."
 
-                results = []
-                for item in data.get("items", [])[:5]:  # Top 5 results
-                    results.append(
-                        f"### {item.get('title')}\nURL: {item.get('link')}\nSnippet: {item.get('snippet')}\n"
-                    )
+            results = []
+            for item in data.get("items", [])[:5]:  # Top 5 results
+                results.append(f"### {item.get('title')}\nURL: {item.get('link')}\nSnippet: {item.get('snippet')}\n")
 
-                return "\n".join(results)
+            return "\n".join(results)
         except Exception as e:
             return f"Error performing Google Search: {str(e)}"
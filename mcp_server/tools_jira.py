@@ -3,12 +3,21 @@
 import base64
 import json
 import os
-import urllib.error
+import re
+import sqlite3
+import sys
+import threading
+import time
 import urllib.parse
-import urllib.request
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 _MCP_DIR = Path(__file__).resolve().parent
+import http_client
+import jira_mirror
+from adf_utils import adf_to_markdown
 from utils import get_project_root, load_env_file
 
 PROJECT_ROOT = get_project_root()
@@ -18,11 +27,43 @@ JIRA_EMAIL="your_email@example.com"
 JIRA_API_TOKEN="your_jira_api_token"
 JIRA_HOST="https://your-domain.atlassian.net"
 JIRA_DEFAULT_PROJECT="PROJ"  # Optional: Default project key for new issues
+# JIRA_MIRROR_JQL="project = PROJ"  # Optional: keep matching issues in a local SQLite mirror
 """
 
 # Load mcp_server/.jira_env into os.environ
 load_env_file(".jira_env", _MCP_DIR, _JIRA_ENV_TEMPLATE)
 
+# Fields _trim_issue reads; searches and bulk fetches request only these by default.
+_ISSUE_FIELDS = ["summary", "status", "assignee", "reporter", "priority", "issuetype", "labels", "description"]
+
+# Descriptions are rendered to Markdown and cut at this many characters.
+_DESCRIPTION_CHARS = 500
+
+# Largest page /search/jql returns when specific fields are requested.
+_SEARCH_PAGE_SIZE = 100
+
+# Bulk tools: at most this many Jira calls in flight; /issue/bulkfetch takes up to 100 keys per call.
+_BULK_CONCURRENCY = int(os.environ.get("JIRA_BULK_CONCURRENCY", "6"))
+_BULK_FETCH_SIZE = 100
+
+# Sprint reports: agile issue page size, story points custom field (Jira Cloud's default
+# "Story point estimate"; override per instance) and cap on listed stale issues.
+_SPRINT_PAGE_SIZE = 50
+_STORY_POINTS_FIELD = os.environ.get("JIRA_STORY_POINTS_FIELD", "customfield_10016")
+_MAX_STALE_ISSUES = 25
+
+# Workflow transitions per (project, issue type id, status id): issues in the same state share
+# them, so bulk transitions only list them once per state.
+_TRANSITIONS: dict[tuple[str, str, str], list[dict]] = {}
+_TRANSITIONS_LOCK = threading.Lock()
+
+# Opt-in local mirror (jira_mirror.py): JIRA_MIRROR_JQL selects the issues kept in SQLite under
+# mcp_env_config/.cache/jira; answers older than JIRA_MIRROR_MAX_AGE seconds trigger a sync first.
+_MIRROR_JQL = os.environ.get("JIRA_MIRROR_JQL", "").strip()
+_MIRROR_MAX_AGE = int(os.environ.get("JIRA_MIRROR_MAX_AGE", "300"))
+_MIRROR_FIELDS = [*_ISSUE_FIELDS, "project", "created", "updated"]
+_MIRROR_LOCK = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -49,7 +90,13 @@ def _get_host() -> tuple[str, str | None]:
     return host, None
 
 
-def _api(method: str, path: str, body: dict | None = None, params: dict | None = None) -> tuple[bool, str]:
+def _api(
+    method: str,
+    path: str,
+    body: dict | None = None,
+    params: dict | None = None,
+    idempotent: bool | None = None,
+) -> tuple[bool, str]:
     """Call Jira REST API v3. Returns (ok, json_string_or_error)."""
     host, err = _get_host()
     if err:
@@ -64,16 +111,17 @@ def _api(method: str, path: str, body: dict | None = None, params: dict | None =
         url = f"{url}?{query}"
 
     data = json.dumps(body).encode() if body is not None else None
-    req = urllib.request.Request(url, data=data, method=method, headers=headers)
-    try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            text = resp.read().decode("utf-8", errors="ignore")
+    ok, text = http_client.request_text(
+        method,
+        url,
+        headers=headers,
+        data=data,
+        idempotent=idempotent,
+        **http_client.atlassian_policy(),
+    )
+    if ok:
         return True, text or "{}"
-    except urllib.error.HTTPError as e:
-        msg = e.read().decode("utf-8", errors="ignore")
-        return False, f"HTTP {e.code}: {msg[:600]}"
-    except Exception as e:
-        return False, f"Error: {e}"
+    return False, text
 
 
 def _agile_api(method: str, path: str, params: dict | None = None) -> tuple[bool, str]:
@@ -90,16 +138,276 @@ def _agile_api(method: str, path: str, params: dict | None = None) -> tuple[bool
         query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
         url = f"{url}?{query}"
 
-    req = urllib.request.Request(url, method=method, headers=headers)
-    try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            text = resp.read().decode("utf-8", errors="ignore")
+    ok, text = http_client.request_text(method, url, headers=headers, **http_client.atlassian_policy())
+    if ok:
         return True, text or "{}"
-    except urllib.error.HTTPError as e:
-        msg = e.read().decode("utf-8", errors="ignore")
-        return False, f"HTTP {e.code}: {msg[:600]}"
-    except Exception as e:
-        return False, f"Error: {e}"
+    return False, text
+
+
+def _search_pages(
+    jql: str, fields: list[str], max_results: int, page_token: str | None = None
+) -> Iterator[tuple[bool, dict | str]]:
+    """Yield (ok, page_dict_or_error) for /search/jql pages until max_results issues were returned,
+    starting at page_token (from a previous search) when given.
+    The next page is requested in the background while the caller processes the current one;
+    iteration stops after the first error."""
+
+    def fetch(token: str | None, size: int) -> tuple[bool, str]:
+        body: dict = {"jql": jql, "maxResults": size, "fields": fields}
+        if token:
+            body["nextPageToken"] = token
+        # Read-only POST: safe to retry on 429
+        return _api("POST", "/search/jql", body=body, idempotent=True)
+
+    seen = 0
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(fetch, page_token, min(_SEARCH_PAGE_SIZE, max_results))
+        while pending is not None:
+            ok, raw = pending.result()
+            pending = None
+            if not ok:
+                yield False, raw
+                return
+            data = json.loads(raw)
+            page = data.get("issues", [])
+            seen += len(page)
+            token = None if data.get("isLast") else data.get("nextPageToken")
+            if token and page and seen < max_results:
+                pending = pool.submit(fetch, token, min(_SEARCH_PAGE_SIZE, max_results - seen))
+            yield True, data
+
+
+def _mirror_sync(full: bool = False) -> tuple[bool, str]:
+    """Pull issues matching JIRA_MIRROR_JQL into the mirror. Incremental unless full, never synced,
+    or the scope changed; a full sync also drops issues that no longer match."""
+    if not _MIRROR_JQL:
+        return False, "Jira mirror is off. Set JIRA_MIRROR_JQL (e.g. 'project = MTP') in .jira_env."
+    with _MIRROR_LOCK:
+        conn = jira_mirror.connect()
+        try:
+            age = jira_mirror.age_seconds(conn)
+            full = full or age is None or jira_mirror.get_meta(conn, "scope") != _MIRROR_JQL
+            started = time.time()
+            jql = _MIRROR_JQL
+            if not full:
+                # Relative dates sidestep the account's JQL timezone; the extra minutes cover
+                # minute rounding and clock skew (re-fetched issues are simply overwritten).
+                jql = f"({_MIRROR_JQL}) AND updated >= -{int(age // 60) + 2}m"
+            seen: set[str] = set()
+            for ok, data in _search_pages(jql, _MIRROR_FIELDS, sys.maxsize):
+                if not ok:
+                    conn.rollback()
+                    return False, f"Mirror sync failed: {data}"
+                for raw in data.get("issues", []):
+                    fields = raw.get("fields") or {}
+                    issue = _trim_issue(raw)
+                    project = (fields.get("project") or {}).get("key")
+                    jira_mirror.upsert_issue(
+                        conn, issue, project, fields.get("created"), fields.get("updated"), started
+                    )
+                    seen.add(issue["key"])
+            removed = jira_mirror.prune(conn, seen) if full else 0
+            jira_mirror.set_meta(conn, "last_sync", str(started))
+            jira_mirror.set_meta(conn, "scope", _MIRROR_JQL)
+            conn.commit()
+            kind = "Full" if full else "Incremental"
+            return True, (
+                f"{kind} sync: {len(seen)} issue(s) fetched, {removed} removed, "
+                f"{jira_mirror.count(conn)} in mirror ({time.time() - started:.1f}s)."
+            )
+        finally:
+            conn.close()
+
+
+def _mirror_lookup(issue_key: str) -> tuple[dict | None, float | None]:
+    """(mirrored issue, seconds since last sync); (None, None) when the mirror is off or unreadable."""
+    if not _MIRROR_JQL:
+        return None, None
+    try:
+        conn = jira_mirror.connect()
+        try:
+            return jira_mirror.get_issue(conn, issue_key), jira_mirror.age_seconds(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None, None
+
+
+def _split_keys(issue_keys: str) -> list[str]:
+    """'MTP-1, MTP-2 MTP-1' -> ['MTP-1', 'MTP-2'] (order kept, duplicates dropped)."""
+    return list(dict.fromkeys(k.upper() for k in re.split(r"[,\s]+", issue_keys) if k))
+
+
+def _bulk_fetch(keys: list[str], fields: list[str]) -> tuple[dict[str, dict], dict[str, str]]:
+    """Fetch issues through /issue/bulkfetch, up to _BULK_CONCURRENCY chunks of 100 at a time.
+    Returns (raw issues by key, error message by key); every requested key lands in one of them."""
+    chunks = [keys[i : i + _BULK_FETCH_SIZE] for i in range(0, len(keys), _BULK_FETCH_SIZE)]
+
+    def fetch(chunk: list[str]) -> tuple[list[str], tuple[bool, str]]:
+        body = {"issueIdsOrKeys": chunk, "fields": fields}
+        return chunk, _api("POST", "/issue/bulkfetch", body=body, idempotent=True)
+
+    found: dict[str, dict] = {}
+    errors: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(_BULK_CONCURRENCY, len(chunks)))) as pool:
+        for chunk, (ok, raw) in pool.map(fetch, chunks):
+            if not ok:
+                errors.update(dict.fromkeys(chunk, raw))
+                continue
+            for issue in json.loads(raw).get("issues", []):
+                found[str(issue.get("key", "")).upper()] = issue
+                found[str(issue.get("id", ""))] = issue
+            for key in chunk:
+                if key not in found:
+                    errors[key] = "Issue does not exist or you do not have permission to see it."
+    return found, errors
+
+
+def _issue_state(issue: dict) -> tuple[str, str, str]:
+    fields = issue.get("fields") or {}
+    return (
+        (fields.get("project") or {}).get("key", ""),
+        (fields.get("issuetype") or {}).get("id", ""),
+        (fields.get("status") or {}).get("id", ""),
+    )
+
+
+def _load_transitions(issue_key: str, state: tuple[str, str, str]) -> tuple[bool, list[dict] | str]:
+    """List transitions for issue_key and cache them for its workflow state."""
+    ok, raw = _api("GET", f"/issue/{issue_key}/transitions")
+    if not ok:
+        return False, raw
+    transitions = [{"id": t.get("id"), "name": t.get("name", "")} for t in json.loads(raw).get("transitions", [])]
+    with _TRANSITIONS_LOCK:
+        _TRANSITIONS[state] = transitions
+    return True, transitions
+
+
+def _transition_one(issue_key: str, state: tuple[str, str, str], transition_name: str) -> dict:
+    """Apply a transition using the cached list for the issue's state. A stale or condition-limited
+    cache entry (no match, or Jira rejects the id) is refreshed from this issue once."""
+    for refreshed in (False, True):
+        with _TRANSITIONS_LOCK:
+            transitions = None if refreshed else _TRANSITIONS.get(state)
+        if transitions is None:
+            ok, transitions = _load_transitions(issue_key, state)
+            if not ok:
+                return {"key": issue_key, "ok": False, "error": transitions}
+            refreshed = True
+        match = next((t for t in transitions if t["name"].lower() == transition_name.lower()), None)
+        if not match:
+            if not refreshed:
+                continue
+            available = [t["name"] for t in transitions]
+            return {
+                "key": issue_key,
+                "ok": False,
+                "error": f"Transition '{transition_name}' not found.",
+                "available": available,
+            }
+        ok, raw = _api("POST", f"/issue/{issue_key}/transitions", body={"transition": {"id": match["id"]}})
+        if ok:
+            return {"key": issue_key, "ok": True, "to": match["name"]}
+        if refreshed:
+            return {"key": issue_key, "ok": False, "error": raw}
+    return {"key": issue_key, "ok": False, "error": "Transition failed."}
+
+
+def _sprint_report(sprint_id: int, stale_days: int, points_field: str) -> dict | str:
+    """Aggregate a sprint's issues page by page (pages fetched concurrently); no issue bodies kept.
+    Stale issues come from a JQL status-history query run alongside the paging."""
+    fields = ",".join(["status", "issuetype", "assignee", points_field])
+
+    def page(start_at: int, size: int = _SPRINT_PAGE_SIZE) -> tuple[bool, str]:
+        params = {"startAt": start_at, "maxResults": size, "fields": fields}
+        return _agile_api("GET", f"/sprint/{sprint_id}/issue", params=params)
+
+    def stale() -> tuple[bool, dict | str]:
+        jql = (
+            f"sprint = {sprint_id} AND statusCategory != Done AND created <= -{stale_days}d "
+            f"AND NOT status CHANGED AFTER -{stale_days}d ORDER BY updated ASC"
+        )
+        found: list[dict] = []
+        for ok, data in _search_pages(jql, ["summary", "status", "assignee", "updated"], _MAX_STALE_ISSUES):
+            if not ok:
+                return False, data
+            for issue in data.get("issues", []):
+                f = issue.get("fields") or {}
+                found.append(
+                    {
+                        "key": issue.get("key"),
+                        "summary": f.get("summary"),
+                        "status": (f.get("status") or {}).get("name"),
+                        "assignee": (f.get("assignee") or {}).get("displayName"),
+                        "updated": f.get("updated"),
+                    }
+                )
+        return True, found[:_MAX_STALE_ISSUES]
+
+    report: dict = {
+        "issues": 0,
+        "by_status": Counter(),
+        "by_status_category": Counter(),
+        "by_type": Counter(),
+        "by_assignee": Counter(),
+        "points": {"field": points_field, "done": 0.0, "remaining": 0.0, "unestimated": 0},
+    }
+
+    def tally(issues: list[dict]) -> None:
+        for issue in issues:
+            f = issue.get("fields") or {}
+            status = f.get("status") or {}
+            category = (status.get("statusCategory") or {}).get("key")
+            report["issues"] += 1
+            report["by_status"][status.get("name") or "?"] += 1
+            report["by_status_category"][category or "?"] += 1
+            report["by_type"][(f.get("issuetype") or {}).get("name") or "?"] += 1
+            report["by_assignee"][(f.get("assignee") or {}).get("displayName") or "Unassigned"] += 1
+            points = f.get(points_field)
+            if isinstance(points, (int, float)):
+                report["points"]["done" if category == "done" else "remaining"] += points
+            else:
+                report["points"]["unestimated"] += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, _BULK_CONCURRENCY)) as pool:
+        sprint_future = pool.submit(_agile_api, "GET", f"/sprint/{sprint_id}")
+        stale_future = pool.submit(stale) if stale_days > 0 else None
+        ok, raw = page(0)
+        if not ok:
+            return raw
+        first = json.loads(raw)
+        tally(first.get("issues", []))
+        total = int(first.get("total") or 0)
+        # Step by the page length the server actually returned: it may cap maxResults below ours
+        step = len(first.get("issues", []))
+        starts = list(range(step, total, step)) if step else []
+        errors = []
+        for start, (ok, raw) in zip(starts, pool.map(page, starts)):
+            # A page shorter than the step (e.g. a lower cap on later pages) is completed serially
+            end = min(total, start + step)
+            while ok:
+                issues = json.loads(raw).get("issues", [])[: end - start]
+                tally(issues)
+                start += len(issues)
+                if not issues or start >= end:
+                    break
+                ok, raw = page(start, end - start)
+            if not ok:
+                errors.append(raw)
+        ok, raw = sprint_future.result()
+        if ok:
+            report = {"sprint": _trim_sprint(json.loads(raw)), **report}
+        if stale_future is not None:
+            ok, found = stale_future.result()
+            report["stale"] = {"days": stale_days, "issues": found} if ok else {"days": stale_days, "error": found}
+
+    for name in ("by_status", "by_status_category", "by_type", "by_assignee"):
+        report[name] = dict(report[name].most_common())
+    points = report["points"]
+    points["total"] = points["done"] + points["remaining"]
+    if errors:
+        report["errors"] = errors
+    return report
 
 
 # ---------------------------------------------------------------------------
@@ -107,16 +415,6 @@ def _agile_api(method: str, path: str, params: dict | None = None) -> tuple[bool
 # ---------------------------------------------------------------------------
 
 
-def _extract_adf_text(node: dict | None) -> str:
-    """Recursively extract plain text from Atlassian Document Format (ADF)."""
-    if not node:
-        return ""
-    if node.get("type") == "text":
-        return node.get("text", "")
-    parts = [_extract_adf_text(child) for child in node.get("content") or []]
-    return " ".join(p for p in parts if p)
-
-
 def _trim_issue(issue: dict) -> dict:
     fields = issue.get("fields") or {}
     assignee = fields.get("assignee") or {}
@@ -126,7 +424,7 @@ def _trim_issue(issue: dict) -> dict:
     issue_type = fields.get("issuetype") or {}
     labels = fields.get("labels") or []
     raw_desc = fields.get("description")
-    desc_text = _extract_adf_text(raw_desc) if isinstance(raw_desc, dict) else (raw_desc or "")
+    desc_text = adf_to_markdown(raw_desc, _DESCRIPTION_CHARS) if isinstance(raw_desc, dict) else (raw_desc or "")
     host = os.environ.get("JIRA_HOST", "").rstrip("/")
     return {
         "key": issue.get("key"),
@@ -138,11 +436,29 @@ def _trim_issue(issue: dict) -> dict:
         "assignee": assignee.get("displayName"),
         "reporter": reporter.get("displayName"),
         "labels": labels,
-        "description": desc_text[:500] if desc_text else "",
+        "description": desc_text[:_DESCRIPTION_CHARS] if desc_text else "",
         "url": f"{host}/browse/{issue.get('key')}",
     }
 
 
+def _issue_params(fields: str | None, expand: str | None) -> dict:
+    """Query params for issue reads: only the fields _trim_issue uses unless overridden."""
+    return {"fields": fields or ",".join(_ISSUE_FIELDS), "expand": expand or None}
+
+
+def _trim_issue_with_extras(issue: dict, expand: str | None = None) -> dict:
+    """_trim_issue plus any other returned fields (under 'fields') and requested expand sections."""
+    trimmed = _trim_issue(issue)
+    extra = {k: v for k, v in (issue.get("fields") or {}).items() if k not in _ISSUE_FIELDS}
+    if extra:
+        trimmed["fields"] = extra
+    for section in (expand or "").split(","):
+        section = section.strip()
+        if section in issue:
+            trimmed[section] = issue[section]
+    return trimmed
+
+
 def _trim_project(proj: dict) -> dict:
     return {
         "key": proj.get("key"),
@@ -175,51 +491,148 @@ def register(mcp, enabled_fn):  # noqa: ANN001
     # ── READ ────────────────────────────────────────────────────────────────
 
     @mcp.tool()
-    def jira_get_issue(issue_key: str) -> str:
+    def jira_get_issue(
+        issue_key: str,
+        max_age_seconds: int | None = None,
+        fields: str | None = None,
+        expand: str | None = None,
+    ) -> str:
         """Get full details of a Jira ticket (status, assignee, description, labels, etc.).
+        Only the fields shown are requested by default. fields replaces that list (comma-separated,
+        e.g. 'summary,status,customfield_10016' or '*all'); fields beyond the standard ones are returned
+        under 'fields'. expand (e.g. 'renderedFields,changelog') adds those sections.
+        With the local mirror on (JIRA_MIRROR_JQL), mirrored tickets synced within max_age_seconds
+        (default JIRA_MIRROR_MAX_AGE) are answered locally; 0 always asks Jira.
         Example: jira_get_issue('MTP-1234')
         """
         if not enabled_fn("jira"):
             return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
-        ok, raw = _api("GET", f"/issue/{issue_key}")
+        use_mirror = max_age_seconds != 0 and not fields and not expand
+        cached, age = _mirror_lookup(issue_key) if use_mirror else (None, None)
+        limit = _MIRROR_MAX_AGE if max_age_seconds is None else max_age_seconds
+        if cached and age is not None and age <= limit:
+            return json.dumps(cached, indent=2)
+        ok, raw = _api("GET", f"/issue/{issue_key}", params=_issue_params(fields, expand))
         if not ok:
+            if cached and age is not None:
+                # Offline: a stale mirrored copy beats an error
+                return json.dumps({**cached, "mirror_age_seconds": round(age)}, indent=2)
             return raw
-        return json.dumps(_trim_issue(json.loads(raw)), indent=2)
+        return json.dumps(_trim_issue_with_extras(json.loads(raw), expand), indent=2)
 
     @mcp.tool()
     def jira_search_issues(
         jql: str,
         max_results: int = 25,
         fields: str | None = None,
+        next_page_token: str | None = None,
     ) -> str:
-        """Search Jira issues using JQL.
+        """Search Jira issues using JQL. Follows result pages until max_results issues are returned;
+        has_more/next_page_token report whether more matches exist. Pass next_page_token back (with
+        the same jql) to continue after the last issue returned.
         Examples:
           jira_search_issues('project = MTP AND status = "In Progress"')
           jira_search_issues('assignee = currentUser() AND sprint in openSprints()')
         """
         if not enabled_fn("jira"):
             return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
-        field_list = (
-            fields.split(",")
-            if fields
-            else [
-                "summary",
-                "status",
-                "assignee",
-                "reporter",
-                "priority",
-                "issuetype",
-                "labels",
-                "description",
-            ]
+        field_list = fields.split(",") if fields else _ISSUE_FIELDS
+        max_results = max(1, max_results)
+        issues: list[dict] = []
+        next_token = None
+        error = None
+        for ok, data in _search_pages(jql, field_list, max_results, next_page_token):
+            if not ok:
+                if not issues:
+                    return data
+                error = data
+                break
+            next_token = None if data.get("isLast") else data.get("nextPageToken")
+            page = data.get("issues", [])[: max_results - len(issues)]
+            issues.extend(_trim_issue_with_extras(i) for i in page)
+        # /search/jql does not report a total match count
+        result: dict = {"returned": len(issues), "has_more": bool(next_token), "issues": issues}
+        if next_token:
+            result["next_page_token"] = next_token
+        if error:
+            result["error"] = error
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    def jira_get_issues(issue_keys: str, max_age_seconds: int | None = None) -> str:
+        """Get several Jira tickets at once (comma- or space-separated keys), fetched concurrently.
+        Returns issues in the requested order plus an error per key that could not be read.
+        Mirrored tickets are served locally like jira_get_issue.
+        Example: jira_get_issues('MTP-1234, MTP-1235, MTP-1240')
+        """
+        if not enabled_fn("jira"):
+            return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
+        keys = _split_keys(issue_keys)
+        if not keys:
+            return "No issue keys given."
+        limit = _MIRROR_MAX_AGE if max_age_seconds is None else max_age_seconds
+        issues: dict[str, dict] = {}
+        if max_age_seconds != 0:
+            for key in keys:
+                cached, age = _mirror_lookup(key)
+                if cached and age is not None and age <= limit:
+                    issues[key] = cached
+        missing = [k for k in keys if k not in issues]
+        found, errors = _bulk_fetch(missing, _ISSUE_FIELDS) if missing else ({}, {})
+        for key in missing:
+            if key in found:
+                issues[key] = _trim_issue(found[key])
+        return json.dumps(
+            {"issues": [issues[k] for k in keys if k in issues], "errors": errors},
+            indent=2,
         )
-        body: dict = {"jql": jql, "maxResults": max_results, "fields": field_list}
-        ok, raw = _api("POST", "/search/jql", body=body)
-        if not ok:
-            return raw
-        data = json.loads(raw)
-        issues = [_trim_issue(i) for i in data.get("issues", [])]
-        return json.dumps({"total": data.get("total"), "issues": issues}, indent=2)
+
+    @mcp.tool()
+    def jira_mirror_search(query: str = "", max_results: int = 50, max_age_seconds: int | None = None) -> str:
+        """Filter the local Jira mirror (JIRA_MIRROR_JQL) with a JQL subset; no network when fresh.
+        Fields: key, project, summary, description, text, status, type, priority, assignee, reporter,
+        labels, created, updated. Operators: = != ~ !~ IN, NOT IN, IS [NOT] EMPTY, and < <= > >= for
+        dates (-7d, -12h, YYYY-MM-DD). Combine with AND / OR / NOT and parentheses; ORDER BY supported.
+        Syncs first when the mirror is older than max_age_seconds (default JIRA_MIRROR_MAX_AGE);
+        if that sync fails the stale mirror is still searched.
+        Example: jira_mirror_search('status = "In Progress" AND assignee ~ jane AND updated >= -7d')
+        """
+        if not enabled_fn("jira"):
+            return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
+        if not _MIRROR_JQL:
+            return "Jira mirror is off. Set JIRA_MIRROR_JQL (e.g. 'project = MTP') in .jira_env."
+        try:
+            jira_mirror.compile_filter(query)
+        except ValueError as e:
+            return f"Filter error: {e}"
+        limit = _MIRROR_MAX_AGE if max_age_seconds is None else max_age_seconds
+        conn = jira_mirror.connect()
+        try:
+            age = jira_mirror.age_seconds(conn)
+            sync_error = None
+            if age is None or age > limit:
+                ok, msg = _mirror_sync()
+                if not ok:
+                    if age is None:
+                        return msg
+                    sync_error = msg
+                age = jira_mirror.age_seconds(conn)
+            total, issues = jira_mirror.search(conn, query, max(1, max_results))
+        finally:
+            conn.close()
+        result: dict = {"total": total, "returned": len(issues), "mirror_age_seconds": round(age), "issues": issues}
+        if sync_error:
+            result["sync_error"] = sync_error
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    def jira_mirror_sync(full: bool = False) -> str:
+        """Sync the local Jira mirror now (issues matching JIRA_MIRROR_JQL updated since the last sync).
+        full=True re-fetches everything and drops issues that no longer match.
+        """
+        if not enabled_fn("jira"):
+            return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
+        return _mirror_sync(full)[1]
 
     @mcp.tool()
     def jira_list_projects(max_results: int = 50) -> str:
@@ -262,8 +675,15 @@ def register(mcp, enabled_fn):  # noqa: ANN001
         return json.dumps([_trim_sprint(s) for s in data.get("values", [])], indent=2)
 
     @mcp.tool()
-    def jira_get_sprint_issues(board_id: int, sprint_id: int, max_results: int = 50) -> str:
+    def jira_get_sprint_issues(
+        board_id: int,
+        sprint_id: int,
+        max_results: int = 50,
+        fields: str | None = None,
+        expand: str | None = None,
+    ) -> str:
         """Get all issues in a specific sprint.
+        fields / expand work as in jira_get_issue (default: only the fields shown).
         Example: jira_get_sprint_issues(42, 101)
         """
         if not enabled_fn("jira"):
@@ -271,14 +691,29 @@ def register(mcp, enabled_fn):  # noqa: ANN001
         ok, raw = _agile_api(
             "GET",
             f"/board/{board_id}/sprint/{sprint_id}/issue",
-            params={"maxResults": max_results},
+            params={"maxResults": max_results, **_issue_params(fields, expand)},
         )
         if not ok:
             return raw
         data = json.loads(raw)
-        issues = [_trim_issue(i) for i in data.get("issues", [])]
+        issues = [_trim_issue_with_extras(i, expand) for i in data.get("issues", [])]
         return json.dumps({"total": data.get("total"), "issues": issues}, indent=2)
 
+    @mcp.tool()
+    def jira_sprint_report(sprint_id: int, stale_days: int = 3, points_field: str | None = None) -> str:
+        """Summarise a sprint without listing its issues: counts by status, status category, type and
+        assignee, story points done vs remaining, and open issues whose status has not changed in
+        stale_days days (0 skips that check). Issue pages are fetched concurrently.
+        points_field defaults to JIRA_STORY_POINTS_FIELD (customfield_10016).
+        Example: jira_sprint_report(101, stale_days=5)
+        """
+        if not enabled_fn("jira"):
+            return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
+        report = _sprint_report(sprint_id, max(0, stale_days), points_field or _STORY_POINTS_FIELD)
+        if isinstance(report, str):
+            return report
+        return json.dumps(report, indent=2)
+
     # ── WRITE ───────────────────────────────────────────────────────────────
 
     @mcp.tool()
@@ -449,6 +884,37 @@ def register(mcp, enabled_fn):  # noqa: ANN001
             return raw
         return json.dumps({"transitioned": issue_key, "to": transition_name}, indent=2)
 
+    @mcp.tool()
+    def jira_bulk_transition(issue_keys: str, transition_name: str) -> str:
+        """Move several Jira issues through their workflow by transition name, concurrently.
+        Issue states come from one bulk fetch and transitions are listed once per
+        (project, issue type, status), so N issues cost about N + 2 calls instead of 2N.
+        Returns one result per key.
+        Example: jira_bulk_transition('MTP-1234, MTP-1235', 'Done')
+        """
+        if not enabled_fn("jira"):
+            return "Tool disabled. Add 'jira' to CURSOR_TOOLS_ENABLED."
+        keys = _split_keys(issue_keys)
+        if not keys:
+            return "No issue keys given."
+        found, errors = _bulk_fetch(keys, ["project", "issuetype", "status"])
+        states = {key: _issue_state(found[key]) for key in keys if key in found}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(_BULK_CONCURRENCY, len(keys)))) as pool:
+            # List transitions once per uncached state, then transition every issue
+            with _TRANSITIONS_LOCK:
+                pending = {state: key for key, state in states.items() if state not in _TRANSITIONS}
+            list(pool.map(lambda item: _load_transitions(item[1], item[0]), pending.items()))
+
+            def run(key: str) -> dict:
+                if key not in states:
+                    return {"key": key, "ok": False, "error": errors.get(key, "Issue not found.")}
+                return _transition_one(key, states[key], transition_name)
+
+            results = list(pool.map(run, keys))
+        done = sum(1 for r in results if r["ok"])
+        return json.dumps({"transitioned": done, "failed": len(results) - done, "results": results}, indent=2)
+
     @mcp.tool()
     def jira_assign_issue(issue_key: str, account_id: str) -> str:
         """Assign a Jira issue to a user by their Atlassian accountId.
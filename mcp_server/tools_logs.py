@@ -1,5 +1,13 @@
-"""Logs category: tail_logs, read_log_file. Default: logs/app.log."""
+"""Logs category: tail_logs, read_log_file, query_logs, log_stats, log_errors. Default: logs/app.log."""
 
+import gzip
+import hashlib
+import json
+import random
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 _MCP_DIR = Path(__file__).resolve().parent
@@ -8,31 +16,709 @@ from utils import get_project_root
 PROJECT_ROOT = get_project_root()
 DEFAULT_LOG = "logs/app.log"
 
+# Leading timestamp, e.g. "2026-10-19 10:02:03,123", "[2026-10-19T10:02:03.123Z]". An explicit
+# UTC offset is honoured: all timestamps are compared as naive local time.
+_TS_RE = re.compile(rb"^\[?(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:[.,]\d+)?(Z|[+-]\d{2}:?\d{2}(?!\d))?")
+_LEVEL_RE = re.compile(r"\b(TRACE|DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|FATAL)\b")
+_LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+
+# Sparse index: one (timestamp, byte offset) sample per stride, keyed by resolved path.
+_INDEX_STRIDE = 64 * 1024
+_INDEX_PROBE_LINES = 200
+_LOG_INDEXES: dict[str, dict] = {}
+# Records keep their first lines and their last lines (where a traceback's innermost frames and
+# exception line are); anything between is replaced by one "... omitted" line.
+_MAX_RECORD_LINES = 50
+_RECORD_TAIL_LINES = 20
+
+# Rotated members: app.log, app.log.1, app.log.2.gz, ... First/last timestamps of gzip
+# archives are cached by (size, mtime) since archives are never appended to.
+_ROTATED_RE = re.compile(r"^\.(\d+)(\.gz)?$")
+_ARCHIVE_SPANS: dict[str, dict] = {}
+_TAIL_BLOCK = 64 * 1024
+
+# JSON-lines aggregation (log_stats). Latency samples are reservoir-sampled per group so
+# memory stays bounded however large the log is; group keys beyond the cap fold into "(other)".
+_JSON_TIME_FIELDS = ("timestamp", "@timestamp", "time", "ts", "asctime")
+_JSON_LATENCY_FIELDS = ("duration_ms", "latency_ms", "elapsed_ms", "response_time_ms", "duration", "latency")
+_LATENCY_RESERVOIR = 5000
+_MAX_STAT_GROUPS = 1000
+_MAX_TIME_BUCKETS = 60
+
+# Error fingerprinting (log_errors): variable parts are masked before hashing so that
+# near-identical failures fall into one cluster. Order matters: most specific first.
+_NORMALIZERS = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<TS>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<UUID>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{12,}\b"), "<HEX>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<IP>"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "<N>"),
+    (re.compile(r"'[^']{24,}'|\"[^\"]{24,}\""), "<STR>"),
+]
+_FRAME_RE = re.compile(r'^\s*File "([^"]+)", line \d+, in (\S+)')
+_ERROR_LEVELS = {"ERROR", "CRITICAL"}
+_MAX_ERROR_CLUSTERS = 2000
+_MAX_SAMPLE_LINES = 30
+
+
+def _parse_ts(line: bytes) -> datetime | None:
+    """Parse the leading timestamp of a raw log line. Returns None for continuation lines."""
+    m = _TS_RE.match(line)
+    if not m:
+        return None
+    try:
+        ts = datetime.fromisoformat(f"{m.group(1).decode()} {m.group(2).decode()}{_iso_offset(m.group(3))}")
+    except ValueError:
+        return None
+    return _local_naive(ts)
+
+
+def _iso_offset(zone: bytes | str | None) -> str:
+    """'Z', '+0200' or '+02:00' as an offset datetime.fromisoformat accepts ('' when absent)."""
+    if not zone:
+        return ""
+    zone = zone.decode() if isinstance(zone, bytes) else zone
+    if zone == "Z":
+        return "+00:00"
+    return zone if ":" in zone else f"{zone[:3]}:{zone[3:]}"
+
+
+def _local_naive(ts: datetime) -> datetime:
+    """Aware datetimes converted to naive local time; naive ones are assumed local already."""
+    return ts.astimezone().replace(tzinfo=None) if ts.tzinfo is not None else ts
+
+
+def _rotation_set(path: Path) -> list[Path]:
+    """Return the live log and its rotated members (app.log.1, app.log.2.gz, ...), newest first."""
+    members = []
+    if path.parent.is_dir():
+        for candidate in path.parent.iterdir():
+            if not candidate.name.startswith(path.name):
+                continue
+            m = _ROTATED_RE.match(candidate.name[len(path.name) :])
+            if m and candidate.is_file():
+                members.append((int(m.group(1)), candidate))
+    members.sort(key=lambda item: item[0])
+    live = [path] if path.is_file() else []
+    return live + [member for _, member in members]
+
+
+def _is_gzip(path: Path) -> bool:
+    return path.suffix == ".gz"
+
+
+def _open_log(path: Path):
+    """Open a log member for binary line iteration; gzip members are decompressed as a stream."""
+    return gzip.open(path, "rb") if _is_gzip(path) else open(path, "rb")
+
+
+def _archive_span(path: Path) -> tuple[datetime | None, datetime | None]:
+    """First and last timestamps of a gzip member, computed once per archive version."""
+    stat = path.stat()
+    key = str(path.resolve())
+    span = _ARCHIVE_SPANS.get(key)
+    if span is None or span["size"] != stat.st_size or span["mtime"] != stat.st_mtime_ns:
+        first = last = None
+        with _open_log(path) as f:
+            for raw in f:
+                ts = _parse_ts(raw)
+                if ts is not None:
+                    first = first or ts
+                    last = ts
+        span = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "first": first, "last": last}
+        _ARCHIVE_SPANS[key] = span
+    return span["first"], span["last"]
+
+
+def _tail_member(path: Path, n: int) -> list[str]:
+    """Last n lines of one member. Plain files are read backwards in blocks; gzip is streamed."""
+    if n <= 0:
+        return []
+    if _is_gzip(path):
+        with _open_log(path) as f:
+            tail = deque(f, maxlen=n)
+        return [raw.decode("utf-8", errors="ignore").rstrip("\r\n") for raw in tail]
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return data.decode("utf-8", errors="ignore").splitlines()[-n:]
+
+
+def _parse_level(line: str) -> str | None:
+    m = _LEVEL_RE.search(line[:120])
+    if not m:
+        return None
+    level = m.group(1)
+    return _LEVEL_ALIASES.get(level, level)
+
+
+def _resolve_bound(value: str | None, ref_date: date) -> datetime | None:
+    """Parse 'YYYY-MM-DD HH:MM[:SS]', 'YYYY-MM-DD' or 'HH:MM[:SS]' (taken on ref_date).
+    Log timestamps are naive local time, so a bound with a UTC offset is converted to local time."""
+    if not value:
+        return None
+    value = value.strip()
+    if re.fullmatch(r"\d{1,2}:\d{2}(:\d{2})?", value):
+        parts = [int(p) for p in value.split(":")]
+        return datetime(ref_date.year, ref_date.month, ref_date.day, *parts)
+    m = re.search(r"(Z|[+-]\d{2}:?\d{2})$", value) if re.match(r"\d{4}-\d{2}-\d{2}[T ]", value) else None
+    if m:
+        value = value[: m.start()] + _iso_offset(m.group(1))
+    return _local_naive(datetime.fromisoformat(value.replace("T", " ")))
+
+
+def _get_index(path: Path) -> dict:
+    """Return the sparse timestamp index for path, extending it over any newly appended bytes."""
+    stat = path.stat()
+    key = str(path.resolve())
+    index = _LOG_INDEXES.get(key)
+    if index is None or index["inode"] != stat.st_ino or stat.st_size < index["size"]:
+        # New file, rotated or truncated: start over
+        index = {"inode": stat.st_ino, "size": 0, "next_probe": 0, "ts": [], "offsets": []}
+        _LOG_INDEXES[key] = index
+
+    with open(path, "rb") as f:
+        probe = index["next_probe"]
+        while probe < stat.st_size:
+            f.seek(probe)
+            pos = probe
+            if probe > 0:
+                # Skip the partial line we landed in
+                pos += len(f.readline())
+            found = None
+            for _ in range(_INDEX_PROBE_LINES):
+                line = f.readline()
+                if not line:
+                    break
+                ts = _parse_ts(line)
+                if ts is not None:
+                    found = (ts, pos)
+                    break
+                pos += len(line)
+            if found is None and pos >= stat.st_size:
+                # Hit EOF without a timestamp; retry from here once the file grows
+                break
+            if found is not None and (not index["offsets"] or found[1] > index["offsets"][-1]):
+                index["ts"].append(found[0])
+                index["offsets"].append(found[1])
+            probe += _INDEX_STRIDE
+        index["next_probe"] = probe
+    index["size"] = stat.st_size
+    return index
+
+
+def _byte_range(index: dict, since: datetime | None, until: datetime | None) -> tuple[int, int]:
+    """Binary-search the index for the byte range that can contain records in [since, until]."""
+    start, end = 0, index["size"]
+    if since is not None:
+        i = bisect_left(index["ts"], since) - 1
+        if i >= 0:
+            start = index["offsets"][i]
+    if until is not None:
+        j = bisect_right(index["ts"], until)
+        if j < len(index["offsets"]):
+            end = index["offsets"][j]
+    return start, end
+
+
+def _iter_records(f, start: int, end: float):
+    """Yield (timestamp, lines) for each record starting in [start, end).
+    A record is a timestamped line plus its continuation lines (e.g. a traceback); long records keep
+    their head and tail."""
+    f.seek(start)
+    pos = start
+    ts = None
+    lines: list[str] = []
+    tail: deque[str] = deque(maxlen=_RECORD_TAIL_LINES)
+    omitted = 0
+
+    def record() -> list[str]:
+        if omitted:
+            return lines + [f"    ... ({omitted} line(s) omitted)"] + list(tail)
+        return lines + list(tail)
+
+    for raw in f:
+        line_start = pos
+        pos += len(raw)
+        line_ts = _parse_ts(raw)
+        if line_ts is not None:
+            if ts is not None:
+                yield ts, record()
+            if line_start >= end:
+                return
+            ts, lines, omitted = line_ts, [], 0
+            tail.clear()
+        if ts is None:
+            continue
+        line = raw.decode("utf-8", errors="ignore").rstrip("\r\n")
+        if len(lines) < _MAX_RECORD_LINES - _RECORD_TAIL_LINES:
+            lines.append(line)
+        else:
+            if len(tail) == tail.maxlen:
+                omitted += 1
+            tail.append(line)
+    if ts is not None:
+        yield ts, record()
+
+
+def _query_member(
+    path: Path,
+    since: datetime | None,
+    until: datetime | None,
+    levels: set[str],
+    regex: re.Pattern | None,
+    limit: int,
+) -> list[str]:
+    """Matching records from one member, oldest first. Gzip archives outside the window are skipped whole."""
+    if _is_gzip(path):
+        first, last = _archive_span(path)
+        if first is None or (since and last < since) or (until and first > until):
+            return []
+        start, end = 0, float("inf")
+    else:
+        start, end = _byte_range(_get_index(path), since, until)
+
+    results = []
+    with _open_log(path) as f:
+        for ts, lines in _iter_records(f, start, end):
+            if since and ts < since:
+                continue
+            if until and ts > until:
+                break
+            if levels and _parse_level(lines[0]) not in levels:
+                continue
+            text = "\n".join(lines)
+            if regex and not regex.search(text):
+                continue
+            results.append(text)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _json_field(record: dict, path: str):
+    """Look up a dotted field path, e.g. 'request.path'."""
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _json_ts(value) -> datetime | None:
+    """Parse an ISO-8601 string or epoch seconds/milliseconds into a naive local datetime."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000 if value > 1e12 else value)
+    if isinstance(value, str):
+        return _parse_ts(value.encode())
+    return None
+
+
+def _record_ts(record: dict, time_field: str | None) -> datetime | None:
+    if time_field:
+        return _json_ts(_json_field(record, time_field))
+    return next((_json_ts(record[k]) for k in _JSON_TIME_FIELDS if k in record), None)
+
+
+def _latest_json_ts(path: Path, time_field: str | None) -> datetime | None:
+    """Timestamp of the newest JSON record near the end of a member (reference date for HH:MM bounds)."""
+    for line in reversed(_tail_member(path, _INDEX_PROBE_LINES)):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and (ts := _record_ts(record, time_field)) is not None:
+            return ts
+    return None
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[idx], 2)
+
+
+def _new_group() -> dict:
+    return {"count": 0, "latency_n": 0, "latency_sum": 0.0, "latency_max": None, "samples": []}
+
+
+def _add_latency(group: dict, value: float) -> None:
+    group["latency_n"] += 1
+    group["latency_sum"] += value
+    group["latency_max"] = value if group["latency_max"] is None else max(group["latency_max"], value)
+    samples = group["samples"]
+    if len(samples) < _LATENCY_RESERVOIR:
+        samples.append(value)
+    else:
+        j = random.randrange(group["latency_n"])
+        if j < _LATENCY_RESERVOIR:
+            samples[j] = value
+
+
+def _summarize_group(group: dict, total: int, span_minutes: float) -> dict:
+    out = {
+        "count": group["count"],
+        "share": round(group["count"] / total, 4) if total else 0,
+        "per_minute": round(group["count"] / span_minutes, 2) if span_minutes else None,
+    }
+    if group["latency_n"]:
+        samples = sorted(group["samples"])
+        out["latency"] = {
+            "avg": round(group["latency_sum"] / group["latency_n"], 2),
+            "p50": _percentile(samples, 50),
+            "p90": _percentile(samples, 90),
+            "p95": _percentile(samples, 95),
+            "p99": _percentile(samples, 99),
+            "max": round(group["latency_max"], 2),
+        }
+    return out
+
+
+def _bucket_timeline(buckets: Counter, bucket_seconds: int) -> dict:
+    """Render bucket counts, coarsening the bucket width until at most _MAX_TIME_BUCKETS remain."""
+    if not buckets:
+        return {"bucket_seconds": bucket_seconds, "counts": {}}
+    lo, hi = min(buckets), max(buckets)
+    factor = 1
+    while (hi - lo) // factor + 1 > _MAX_TIME_BUCKETS:
+        factor *= 2
+    merged: Counter = Counter()
+    for key, count in buckets.items():
+        merged[lo + (key - lo) // factor * factor] += count
+    width = bucket_seconds * factor
+    epoch = datetime(1970, 1, 1)
+    counts = {(epoch + timedelta(seconds=k * bucket_seconds)).isoformat(): merged[k] for k in sorted(merged)}
+    return {"bucket_seconds": width, "counts": counts}
+
+
+def _normalize(text: str) -> str:
+    for pattern, token in _NORMALIZERS:
+        text = pattern.sub(token, text)
+    return text.strip()
+
+
+def _error_signature(lines: list[str]) -> str:
+    """Normalized signature of an error record: message, traceback frames and final exception line."""
+    parts = [_normalize(lines[0])]
+    frames = [m.group(1).rsplit("/", 1)[-1] + ":" + m.group(2) for m in map(_FRAME_RE.match, lines[1:]) if m]
+    if frames:
+        parts.append(" > ".join(frames[-5:]))
+    tail = next((line for line in reversed(lines[1:]) if line.strip() and not line.startswith((" ", "\t"))), None)
+    if tail:
+        parts.append(_normalize(tail))
+    return " | ".join(parts)
+
+
+def _sample(lines: list[str]) -> str:
+    """Record text for a cluster sample: head and tail (the exception line) within _MAX_SAMPLE_LINES."""
+    if len(lines) <= _MAX_SAMPLE_LINES:
+        return "\n".join(lines)
+    head = _MAX_SAMPLE_LINES // 2
+    tail = lines[head - _MAX_SAMPLE_LINES + 1 :]
+    return "\n".join(lines[:head] + [f"    ... ({len(lines) - head - len(tail)} line(s) omitted)"] + tail)
+
+
+def _is_error_record(lines: list[str]) -> bool:
+    if _parse_level(lines[0]) in _ERROR_LEVELS:
+        return True
+    return any(line.startswith("Traceback (most recent call last)") for line in lines[1:])
+
 
 def register(mcp, enabled_fn):
     """Register logs tools. Disabled when 'logs' category is off."""
 
     @mcp.tool()
     def tail_logs(n: int = 50, file_path: str | None = None) -> str:
-        """Get last n lines from logs/app.log (default). Pass file_path to use a different file."""
+        """Get last n lines from logs/app.log (default). Pass file_path to use a different file.
+        Continues into rotated members (app.log.1, app.log.2.gz, ...) when the live file is shorter than n.
+        """
         if not enabled_fn("logs"):
             return "Tool disabled. Enable 'logs' in CURSOR_TOOLS_ENABLED."
         path = PROJECT_ROOT / (file_path or DEFAULT_LOG)
-        if not path.exists():
+        members = _rotation_set(path)
+        if not members:
             return f"File not found: {path}"
-        lines = path.read_text().splitlines()
-        tail = lines[-n:] if len(lines) > n else lines
+        tail: list[str] = []
+        for member in members:
+            tail = _tail_member(member, n - len(tail)) + tail
+            if len(tail) >= n:
+                break
         return "\n".join(tail)
 
     @mcp.tool()
     def read_log_file(file_path: str | None = None, lines: int | None = None) -> str:
-        """Read logs/app.log (default). Pass lines to limit (e.g. first 100). Omit lines for full file."""
+        """Read logs/app.log (default). Pass lines to limit (e.g. first 100). Omit lines for full file.
+        Gzip-compressed rotated members (e.g. logs/app.log.2.gz) are decompressed transparently.
+        """
         if not enabled_fn("logs"):
             return "Tool disabled. Enable 'logs' in CURSOR_TOOLS_ENABLED."
         path = PROJECT_ROOT / (file_path or DEFAULT_LOG)
         if not path.exists():
             return f"File not found: {path}"
-        content = path.read_text()
-        if lines is not None:
-            content = "\n".join(content.splitlines()[:lines])
-        return content
+        if lines is None:
+            with _open_log(path) as f:
+                return f.read().decode("utf-8", errors="ignore")
+        head = []
+        with _open_log(path) as f:
+            for raw in f:
+                if len(head) >= lines:
+                    break
+                head.append(raw.decode("utf-8", errors="ignore").rstrip("\r\n"))
+        return "\n".join(head)
+
+    @mcp.tool()
+    def query_logs(
+        since: str | None = None,
+        until: str | None = None,
+        level: str | None = None,
+        pattern: str | None = None,
+        file_path: str | None = None,
+        max_results: int = 100,
+        include_rotated: bool = True,
+    ) -> str:
+        """Filter log records by time window, level and regex without reading the whole file.
+        since/until: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]' (date of the latest log entry).
+        level: comma-separated, e.g. 'ERROR,CRITICAL'. pattern: regex matched against the whole record.
+        include_rotated: also search app.log.1, app.log.2.gz, ... (newest first); archives outside the window are skipped.
+        Example: query_logs(since='10:02', until='10:05', level='ERROR')
+        """
+        if not enabled_fn("logs"):
+            return "Tool disabled. Enable 'logs' in CURSOR_TOOLS_ENABLED."
+        path = PROJECT_ROOT / (file_path or DEFAULT_LOG)
+        members = _rotation_set(path) if include_rotated else [path] if path.is_file() else []
+        if not members:
+            return f"File not found: {path}"
+        newest = members[0]
+        if _is_gzip(newest):
+            ref_ts = _archive_span(newest)[1]
+        else:
+            index = _get_index(newest)
+            ref_ts = index["ts"][-1] if index["ts"] else None
+        ref_date = ref_ts.date() if ref_ts else date.today()
+        try:
+            since_dt = _resolve_bound(since, ref_date)
+            until_dt = _resolve_bound(until, ref_date)
+        except ValueError as e:
+            return f"Invalid time bound: {e}"
+        levels = {_LEVEL_ALIASES.get(lv, lv) for lv in (level or "").upper().replace(" ", "").split(",") if lv}
+        try:
+            regex = re.compile(pattern) if pattern else None
+        except re.error as e:
+            return f"Invalid pattern: {e}"
+
+        sections = []
+        total = 0
+        for member in members:
+            found = _query_member(member, since_dt, until_dt, levels, regex, max_results - total)
+            if found:
+                sections.append(f"== {member.name} ({len(found)}) ==\n" + "\n".join(found))
+                total += len(found)
+            if total >= max_results:
+                break
+            if since_dt and not _is_gzip(member):
+                # Members are newest first: once one starts at or before since, older ones cannot match
+                first = _get_index(member)["ts"][:1]
+                if first and first[0] <= since_dt:
+                    break
+
+        header = f"{total} record(s) from {len(members)} file(s) in the {path.name} rotation set"
+        if total >= max_results:
+            header += f" — truncated at {max_results}"
+        if not sections:
+            return f"No matching records. ({header})"
+        return header + "\n\n" + "\n\n".join(sections)
+
+    @mcp.tool()
+    def log_stats(
+        group_by: str = "level",
+        file_path: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        where: str | None = None,
+        latency_field: str | None = None,
+        time_field: str | None = None,
+        bucket_seconds: int = 60,
+        max_groups: int = 20,
+        include_rotated: bool = True,
+    ) -> str:
+        """Aggregate a JSON-lines log server-side and return only the summary.
+        Groups records by a field (dotted paths allowed, e.g. 'level', 'endpoint', 'request.status')
+        and reports counts, per-minute rates, a time-bucketed timeline and latency percentiles.
+        where: comma-separated equality filters, e.g. 'status=500,method=GET'.
+        latency_field/time_field default to common names (duration_ms, timestamp, ...).
+        Example: log_stats(group_by='endpoint', where='level=ERROR', since='10:00')
+        """
+        if not enabled_fn("logs"):
+            return "Tool disabled. Enable 'logs' in CURSOR_TOOLS_ENABLED."
+        path = PROJECT_ROOT / (file_path or DEFAULT_LOG)
+        members = _rotation_set(path) if include_rotated else [path] if path.is_file() else []
+        if not members:
+            return f"File not found: {path}"
+        ref_ts = _latest_json_ts(members[0], time_field)
+        ref_date = ref_ts.date() if ref_ts else date.today()
+        try:
+            since_dt = _resolve_bound(since, ref_date)
+            until_dt = _resolve_bound(until, ref_date)
+        except ValueError as e:
+            return f"Invalid time bound: {e}"
+        filters = []
+        for clause in (where or "").split(","):
+            if "=" in clause:
+                k, _, v = clause.partition("=")
+                filters.append((k.strip(), v.strip()))
+        bucket_seconds = max(1, bucket_seconds)
+
+        groups: dict[str, dict] = {}
+        overall = _new_group()
+        buckets: Counter = Counter()
+        total = unparsed = 0
+        first_ts = last_ts = None
+        for member in members:
+            with _open_log(member) as f:
+                for raw in f:
+                    if not raw.lstrip().startswith(b"{"):
+                        unparsed += 1
+                        continue
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        unparsed += 1
+                        continue
+                    if not isinstance(record, dict):
+                        unparsed += 1
+                        continue
+                    if any(str(_json_field(record, k)) != v for k, v in filters):
+                        continue
+                    ts = _record_ts(record, time_field)
+                    if ts is not None:
+                        if (since_dt and ts < since_dt) or (until_dt and ts > until_dt):
+                            continue
+                        first_ts = ts if first_ts is None or ts < first_ts else first_ts
+                        last_ts = ts if last_ts is None or ts > last_ts else last_ts
+                        buckets[int((ts - datetime(1970, 1, 1)).total_seconds()) // bucket_seconds] += 1
+                    elif since_dt or until_dt:
+                        continue
+
+                    key = str(_json_field(record, group_by))
+                    if key not in groups and len(groups) >= _MAX_STAT_GROUPS:
+                        key = "(other)"
+                    group = groups.setdefault(key, _new_group())
+                    group["count"] += 1
+                    overall["count"] += 1
+                    total += 1
+                    if latency_field:
+                        latency = _json_field(record, latency_field)
+                    else:
+                        latency = next((record[k] for k in _JSON_LATENCY_FIELDS if k in record), None)
+                    if isinstance(latency, (int, float)) and not isinstance(latency, bool):
+                        _add_latency(group, float(latency))
+                        _add_latency(overall, float(latency))
+
+        if not total:
+            return f"No JSON records matched. ({unparsed} non-JSON line(s) skipped)"
+        span_minutes = (last_ts - first_ts).total_seconds() / 60 if first_ts and last_ts != first_ts else 0
+        ranked = sorted(groups.items(), key=lambda item: item[1]["count"], reverse=True)
+        summary = {
+            "records": total,
+            "non_json_lines": unparsed,
+            "first": first_ts.isoformat() if first_ts else None,
+            "last": last_ts.isoformat() if last_ts else None,
+            "group_by": group_by,
+            "distinct_groups": len(groups),
+            "overall": _summarize_group(overall, total, span_minutes),
+            "groups": {k: _summarize_group(g, total, span_minutes) for k, g in ranked[:max_groups]},
+            "timeline": _bucket_timeline(buckets, bucket_seconds),
+        }
+        return json.dumps(summary, indent=2)
+
+    @mcp.tool()
+    def log_errors(
+        file_path: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        max_clusters: int = 20,
+        include_rotated: bool = True,
+    ) -> str:
+        """Deduplicate errors: group ERROR/CRITICAL records and multi-line tracebacks into clusters.
+        Ids, numbers, timestamps, UUIDs and hex values are masked into a fingerprint, so thousands of
+        near-identical stack traces come back as one cluster with count, first/last seen and one sample.
+        Example: log_errors(since='09:00')
+        """
+        if not enabled_fn("logs"):
+            return "Tool disabled. Enable 'logs' in CURSOR_TOOLS_ENABLED."
+        path = PROJECT_ROOT / (file_path or DEFAULT_LOG)
+        members = _rotation_set(path) if include_rotated else [path] if path.is_file() else []
+        if not members:
+            return f"File not found: {path}"
+        newest = members[0]
+        index = None if _is_gzip(newest) else _get_index(newest)
+        ref_date = index["ts"][-1].date() if index and index["ts"] else date.today()
+        try:
+            since_dt = _resolve_bound(since, ref_date)
+            until_dt = _resolve_bound(until, ref_date)
+        except ValueError as e:
+            return f"Invalid time bound: {e}"
+
+        clusters: dict[str, dict] = {}
+        errors = overflow = 0
+        for member in members:
+            if _is_gzip(member):
+                first, last = _archive_span(member)
+                if first is None or (since_dt and last < since_dt) or (until_dt and first > until_dt):
+                    continue
+                start, end = 0, float("inf")
+            else:
+                start, end = _byte_range(_get_index(member), since_dt, until_dt)
+            with _open_log(member) as f:
+                for ts, lines in _iter_records(f, start, end):
+                    if (since_dt and ts < since_dt) or (until_dt and ts > until_dt):
+                        continue
+                    if not _is_error_record(lines):
+                        continue
+                    errors += 1
+                    signature = _error_signature(lines)
+                    fingerprint = hashlib.sha1(signature.encode()).hexdigest()[:12]
+                    cluster = clusters.get(fingerprint)
+                    if cluster is None:
+                        if len(clusters) >= _MAX_ERROR_CLUSTERS:
+                            overflow += 1
+                            continue
+                        cluster = clusters[fingerprint] = {
+                            "count": 0,
+                            "first_seen": ts,
+                            "last_seen": ts,
+                            "signature": signature[:300],
+                            "sample": _sample(lines),
+                        }
+                    cluster["count"] += 1
+                    cluster["first_seen"] = min(cluster["first_seen"], ts)
+                    if ts > cluster["last_seen"]:
+                        cluster["last_seen"] = ts
+                        cluster["sample"] = _sample(lines)
+
+        if not errors:
+            return "No error records found."
+        ranked = sorted(clusters.items(), key=lambda item: item[1]["count"], reverse=True)
+        result = {
+            "error_records": errors,
+            "distinct_clusters": len(clusters),
+            "unclustered_overflow": overflow,
+            "clusters": [
+                {
+                    "fingerprint": fp,
+                    "count": c["count"],
+                    "first_seen": c["first_seen"].isoformat(),
+                    "last_seen": c["last_seen"].isoformat(),
+                    "signature": c["signature"],
+                    "sample": c["sample"],
+                }
+                for fp, c in ranked[:max_clusters]
+            ],
+        }
+        return json.dumps(result, indent=2)
@@ -6,33 +6,58 @@ import shutil
 import ssl
 import subprocess
 import tempfile
-import urllib.error
 import urllib.parse
-import urllib.request
 from pathlib import Path
 from typing import Any
 
+# Built once and reused; see _build_ssl_context. Holds "key", "context" and the certifi bundle path.
+_SSL_CACHE: dict = {}
+
+
+def _certifi_cafile() -> str | None:
+    """Path to certifi's CA bundle, resolved once per process (None if certifi is not installed)."""
+    if "cafile" not in _SSL_CACHE:
+        try:
+            import certifi
+
+            _SSL_CACHE["cafile"] = certifi.where()
+        except ImportError:
+            _SSL_CACHE["cafile"] = None
+    return _SSL_CACHE["cafile"]
+
 
 def _build_ssl_context() -> ssl.SSLContext:
     """Build SSL context using certifi if available, else default.
     Resolves macOS 'Basic Constraints of CA cert not marked critical' error.
     Set POSTMAN_SSL_VERIFY=false in .postman_env to disable verification (last resort).
+    The context is cached and only rebuilt when POSTMAN_SSL_VERIFY or the CA bundle file changes,
+    so keep-alive connections in http_client can be reused across calls.
     """
-    if os.environ.get("POSTMAN_SSL_VERIFY", "true").lower() == "false":
+    verify = os.environ.get("POSTMAN_SSL_VERIFY", "true").lower() != "false"
+    cafile = _certifi_cafile() if verify else None
+    try:
+        bundle_mtime = os.stat(cafile).st_mtime_ns if cafile else None
+    except OSError:
+        bundle_mtime = None
+    key = (verify, cafile, bundle_mtime)
+    if _SSL_CACHE.get("key") == key:
+        return _SSL_CACHE["context"]
+
+    if not verify:
         ctx = ssl.create_default_context()
         ctx.check_hostname = False
         ctx.verify_mode = ssl.CERT_NONE
-        return ctx
-    try:
-        import certifi
-
-        return ssl.create_default_context(cafile=certifi.where())
-    except ImportError:
-        pass
-    return ssl.create_default_context()
+    elif cafile and bundle_mtime is not None:
+        ctx = ssl.create_default_context(cafile=cafile)
+    else:
+        ctx = ssl.create_default_context()
+    _SSL_CACHE["key"] = key
+    _SSL_CACHE["context"] = ctx
+    return ctx
 
 
 _MCP_DIR = Path(__file__).resolve().parent
+import http_client
 from utils import get_project_root, load_env_file
 
 PROJECT_ROOT = get_project_root()
@@ -75,16 +100,15 @@ def _api_json(method: str, path: str, params: dict | None = None, body: dict | N
     if body is not None:
         data = json.dumps(body).encode("utf-8")
         headers["Content-Type"] = "application/json"
-    req = urllib.request.Request(url, data=data, method=method, headers=headers)
+    ok, text = http_client.request_text(
+        method, url, headers=headers, data=data, context=_build_ssl_context(), error_chars=500
+    )
+    if not ok:
+        return False, text
+    if not text:
+        return True, {}
     try:
-        with urllib.request.urlopen(req, timeout=20, context=_build_ssl_context()) as resp:
-            text = resp.read().decode("utf-8", errors="ignore")
-        if not text:
-            return True, {}
         return True, json.loads(text)
-    except urllib.error.HTTPError as e:
-        msg = e.read().decode("utf-8", errors="ignore")
-        return False, f"HTTP {e.code}: {msg[:500]}"
     except Exception as e:
         return False, f"Error: {e}"
 
@@ -97,3 +97,13 @@ def load_env_file(filename: str, mcp_dir: Path, template: str) -> None:
             k, _, v = line.partition("=")
             # setdefault ensures we don't overwrite if it's already set in true environment
             os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+
+
+def get_cache_dir(name: str) -> Path:
+    """
+    Return PROJECT_ROOT/mcp_env_config/.cache/{name}, creating it on first use.
+    Tools keep derived, safely deletable data here (e.g. blame results, page bodies).
+    """
+    cache_dir = get_project_root() / "mcp_env_config" / ".cache" / name
+    cache_dir.mkdir(exist_ok=True, parents=True)
+    return cache_dir